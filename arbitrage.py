@@ -1,18 +1,71 @@
 import time
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 from config import CONFIG
 from binance.spot import Spot as Client
 import logging
 from logging.handlers import RotatingFileHandler
-from binance.error import ClientError
+from binance.error import ClientError, ServerError
 import threading
+import itertools
 from enum import Enum
 import math
+import json
+import importlib
 import requests
+import config as config_module
+from grid_store import GridStateStore
+from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
+from binance.websocket.spot.websocket_api import SpotWebsocketAPIClient
+from binance.websocket.dispatcher import MessageDispatcher
+from binance.lib.utils import get_uuid
+from binance.lib.rate_limiter import RateLimiter
+from binance.lib.clock import ClockSync
 
-spot_client = Client(api_key=CONFIG["API_KEY"], api_secret=CONFIG["API_SECRET"])
+slow_request_seconds = CONFIG.get("SLOW_REQUEST_SECONDS", 1)
+
+
+def log_request_timing(timing: dict):
+    """
+    记录慢请求的各阶段耗时，区分是重新建立连接还是Binance响应慢
+    """
+    if timing["total"] < slow_request_seconds:
+        return
+    if timing.get("reused", True):
+        phases = "复用连接"
+    else:
+        phases = "新建连接 dns: {:.3f}s, connect: {:.3f}s, tls: {:.3f}s".format(
+            timing["dns"], timing["connect"], timing["tls"]
+        )
+    logger.warning(
+        "慢请求 {} {} status: {}, 总耗时: {:.3f}s, 首字节: {:.3f}s, {}".format(
+            timing["method"], timing["url_path"], timing["status_code"],
+            timing["total"], timing.get("ttfb", 0), phases
+        )
+    )
+
+
+# REST和WebSocket API共享的服务器时间估计，签名请求的timestamp按其修正，避免本地时钟漂移导致-1021
+server_clock = ClockSync()
+
+# 所有线程共享同一个限速器，按响应头中的已用权重和下单数控制请求节奏，下单优先于查询
+# 连接池大小需覆盖同时发请求的线程数（每个品种一个线程，另有余额、价格等线程）
+spot_client = Client(
+    api_key=CONFIG["API_KEY"],
+    api_secret=CONFIG["API_SECRET"],
+    rate_limiter=RateLimiter(weight_limit=CONFIG.get("REQUEST_WEIGHT_LIMIT", 3000)),
+    pool_maxsize=CONFIG.get("HTTP_POOL_SIZE", 20),
+    timing_hook=log_request_timing,
+    clock=server_clock,
+)
 balance_buffer = CONFIG["balance_buffer"]
+use_user_data_stream = CONFIG.get("USE_USER_DATA_STREAM", False)
+reconcile_interval = CONFIG.get("RECONCILE_INTERVAL", 30)
+config_reload_interval = CONFIG.get("CONFIG_RELOAD_INTERVAL", 10)
+use_book_ticker_stream = CONFIG.get("USE_BOOK_TICKER_STREAM", False)
+use_ws_order_api = CONFIG.get("USE_WS_ORDER_API", False)
+order_retries = CONFIG.get("ORDER_RETRIES", 2)
+order_generation = itertools.count(int(time.time() * 1000))  # newClientOrderId的代次序号
+grid_store: Optional[GridStateStore] = None  # 在启动时根据STATE_DB创建
 
 def send_wx_notification(title, message):
     """
@@ -37,8 +90,8 @@ def setup_logger():
     logger = logging.getLogger('arbitrage')
     logger.setLevel(logging.INFO)
     
-    # 创建 rotating file handler，最大文件大小为 10MB，保留 5 个备份文件
-    handler = RotatingFileHandler('arbitrage.log', maxBytes=10*1024*1024, backupCount=5, encoding='utf-8')
+    # 创建 rotating file handler，最大文件大小为 10MB，保留 5 个备份文件，首次写入日志时才创建文件
+    handler = RotatingFileHandler('arbitrage.log', maxBytes=10*1024*1024, backupCount=5, encoding='utf-8', delay=True)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
     
@@ -52,14 +105,487 @@ class OrderStatus(Enum):
     ENTRY_PLACED = "已挂入场单"
     WAITING_PROFIT = "等待止盈"
 
-@dataclass
 class OrderInfo:
-    entry_order_id: Optional[str] = None    # 入场订单ID
-    exit_order_id: Optional[str] = None     # 出场订单ID
-    status: OrderStatus = OrderStatus.NO_ORDER  # 订单状态
-    entry_price: float = 0.0                # 入场价格
-    exit_price: float = 0.0                # 出场价格
+    __slots__ = ("entry_order_id", "exit_order_id", "status", "entry_price", "exit_price")
+
+    def __init__(
+        self,
+        entry_order_id: Optional[int] = None,   # 入场订单ID
+        exit_order_id: Optional[int] = None,    # 出场订单ID
+        status: OrderStatus = OrderStatus.NO_ORDER,  # 订单状态
+        entry_price: float = 0.0,               # 入场价格
+        exit_price: float = 0.0,                # 出场价格
+    ):
+        self.entry_order_id = entry_order_id
+        self.exit_order_id = exit_order_id
+        self.status = status
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+
+    def __repr__(self):
+        return (
+            f"OrderInfo(entry_order_id={self.entry_order_id}, exit_order_id={self.exit_order_id}, "
+            f"status={self.status.name}, entry_price={self.entry_price}, exit_price={self.exit_price})"
+        )
+
+
+TICKS_PER_UNIT = 10000  # 价格精度为0.0001，点位以整数tick表示，避免浮点数作为键
+
+
+def price_to_tick(price: float) -> int:
+    return math.floor(price * TICKS_PER_UNIT + 1e-6)
+
+
+def tick_to_price(tick: int) -> float:
+    return tick / TICKS_PER_UNIT
+
+
+
+class OpenOrderSnapshot:
+    """
+    所有品种共享的挂单快照，按symbol和orderId建立索引，
+    在max_age秒内的重复请求直接返回快照，避免每个品种各自查询
+    """
+    SYMBOL_WEIGHT = 6  # 单品种get_open_orders的请求权重
+    ALL_SYMBOLS_WEIGHT = 80  # 不带symbol的get_open_orders的请求权重
+
+    def __init__(self, max_age: float = 1):
+        self.max_age = max_age
+        self.orders: Dict[str, Dict[int, dict]] = {}  # symbol -> {orderId: order}
+        self.updated_at = 0
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        symbols = list(CONFIG["SYMBOLS"].keys())
+        orders: Dict[str, Dict[int, dict]] = {symbol: {} for symbol in symbols}
+        # 品种较少时逐个查询的权重更低，品种较多时一次查询全部挂单
+        if len(symbols) * self.SYMBOL_WEIGHT >= self.ALL_SYMBOLS_WEIGHT:
+            response = spot_client.get_open_orders()
+        else:
+            response = []
+            for symbol in symbols:
+                response.extend(spot_client.get_open_orders(symbol))
+        for order in response:
+            orders.setdefault(order["symbol"], {})[order["orderId"]] = order
+        self.orders = orders
+        self.updated_at = time.time()
+
+    def get(self, symbol: str) -> Optional[Dict[int, dict]]:
+        """返回该品种的挂单索引，查询失败时返回None"""
+        with self.lock:
+            if time.time() - self.updated_at >= self.max_age or symbol not in self.orders:
+                try:
+                    self.refresh()
+                except ClientError as error:
+                    logger.error(
+                        "Found error. status: {}, error code: {}, error message: {}".format(
+                            error.status_code, error.error_code, error.error_message
+                        )
+                    )
+                    return None
+            return self.orders.get(symbol, {})
+
+open_order_snapshot = OpenOrderSnapshot()
+
+
+class PriceCache:
+    """
+    盘口价格缓存：通过bookTicker组合流实时更新各品种的买一价和卖一价，
+    推送断开或尚未收到推送时，回退到一次批量ticker_price查询
+    """
+
+    def __init__(self, max_age: float = 1):
+        self.max_age = max_age  # REST回退价格的有效期
+        self.books: Dict[str, dict] = {}  # symbol -> {"bid", "ask", "updated_at", "from_stream"}
+        self.subscribed = set()
+        self.ws_client = None
+        self.connected = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        # 断线后由客户端以随机退避自动重连并重新订阅，24小时前提前切换到新连接
+        self.ws_client = SpotWebsocketStreamClient(
+            on_message=self.on_message,
+            on_open=self.on_open,
+            on_close=self.on_close,
+            on_error=self.on_error,
+            is_combined=True,
+            reconnect=True,
+            parse_json=True,
+            fields={"*": ("s", "b", "a")},
+        )
+        self.subscribed = set()
+        self.sync_symbols()
+        logger.info("盘口价格推送已连接")
+
+    def stop(self):
+        if self.ws_client:
+            try:
+                self.ws_client.stop()
+            except Exception as e:
+                logger.error(f"关闭盘口价格推送失败: {e}")
+        self.ws_client = None
+        self.connected = False
+
+    def sync_symbols(self):
+        """订阅新增品种，取消已移除品种的订阅"""
+        symbols = set(CONFIG["SYMBOLS"].keys())
+        for symbol in symbols - self.subscribed:
+            self.ws_client.book_ticker(symbol)
+        for symbol in self.subscribed - symbols:
+            self.ws_client.book_ticker(symbol, action=SpotWebsocketStreamClient.ACTION_UNSUBSCRIBE)
+            self.books.pop(symbol, None)
+        self.subscribed = symbols
+
+    def on_message(self, _, message):
+        # 客户端已完成解析，只保留品种和买一卖一价
+        data = message.get("data")
+        if not data or "b" not in data:
+            return
+        self.books[data["s"]] = {
+            "bid": float(data["b"]),
+            "ask": float(data["a"]),
+            "updated_at": time.time(),
+            "from_stream": True,
+        }
+
+    def on_open(self, _):
+        # bookTicker只在盘口变化时推送，重连后旧缓存可能已过时，先回退到REST价格
+        self.books.clear()
+        self.connected = True
+
+    def on_close(self, _):
+        logger.warning("盘口价格推送连接已关闭")
+        self.connected = False
+
+    def on_error(self, _, error):
+        logger.error(f"盘口价格推送发生错误，等待重连: {error}")
+        self.connected = False
+
+    def is_fresh(self, book: Optional[dict]) -> bool:
+        if book is None:
+            return False
+        # bookTicker只在盘口变化时推送，连接正常时缓存一直有效
+        if book["from_stream"]:
+            return self.connected
+        return time.time() - book["updated_at"] < self.max_age
+
+    def refresh_from_rest(self):
+        """一次批量ticker_price查询缓存缺失或已过期品种的最新成交价，推送正常的品种保留盘口价格"""
+        symbols = [symbol for symbol in CONFIG["SYMBOLS"] if not self.is_fresh(self.books.get(symbol))]
+        if not symbols:
+            return
+        now = time.time()
+        for ticker in spot_client.ticker_price(symbols=symbols):
+            price = float(ticker["price"])
+            self.books[ticker["symbol"]] = {
+                "bid": price,
+                "ask": price,
+                "updated_at": now,
+                "from_stream": False,
+            }
+
+    def get_book(self, symbol: str) -> dict:
+        """返回买一价、卖一价和更新时间"""
+        book = self.books.get(symbol)
+        if not self.is_fresh(book):
+            with self.lock:
+                book = self.books.get(symbol)
+                if not self.is_fresh(book):
+                    self.refresh_from_rest()
+                    book = self.books[symbol]
+        return book
+
+    def get_price(self, symbol: str) -> float:
+        book = self.get_book(symbol)
+        return (book["bid"] + book["ask"]) / 2
+
+    def run(self):
+        """客户端停止时重建，并同步订阅的品种"""
+        while True:
+            try:
+                if self.ws_client is None or not self.ws_client.socket_manager.is_alive():
+                    self.stop()
+                    self.start()
+                else:
+                    self.sync_symbols()
+            except Exception as e:
+                logger.error(f"盘口价格推送维护发生错误: {e}")
+            time.sleep(5)
+
+price_cache = PriceCache()
+
+
+class WebsocketOrderGateway:
+    """
+    WebSocket API批量下单：所有order.place请求在同一条连接上连续发出，按请求id匹配响应；
+    连接断开或超时未响应时，按newClientOrderId确认订单是否存在，不存在则回退到REST下单
+    """
+
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+        self.ws_client = None
+        self.connected = False
+        self.pending: Dict[str, dict] = {}  # 请求id -> {"event", "response"}
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.ws_client = SpotWebsocketAPIClient(
+            api_key=CONFIG["API_KEY"],
+            api_secret=CONFIG["API_SECRET"],
+            on_message=self.on_message,
+            on_close=self.on_close,
+            on_error=self.on_error,
+            clock=server_clock,
+        )
+        self.connected = True
+        logger.info("WebSocket下单连接已建立")
+
+    def stop(self):
+        if self.ws_client:
+            try:
+                self.ws_client.stop()
+            except Exception as e:
+                logger.error(f"关闭WebSocket下单连接失败: {e}")
+        self.ws_client = None
+        self.connected = False
+
+    def on_message(self, _, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.error(f"无法解析WebSocket下单响应: {message}")
+            return
+        with self.lock:
+            request = self.pending.get(data.get("id"))
+        if request:
+            request["response"] = data
+            request["event"].set()
+
+    def on_close(self, _):
+        logger.warning("WebSocket下单连接已关闭")
+        self.connected = False
+
+    def on_error(self, _, error):
+        logger.error(f"WebSocket下单连接发生错误: {error}")
+        self.connected = False
+
+    def pipeline(self, method: str, params_list: list) -> list:
+        """
+        在同一条连接上连续发出所有请求，再统一等待响应，返回带有响应的请求列表
+        """
+        requests_sent = []
+        for params in params_list:
+            request_id = get_uuid()
+            request = {"id": request_id, "params": params, "event": threading.Event(), "response": None, "sent": False}
+            requests_sent.append(request)
+            if not self.connected:
+                continue
+            with self.lock:
+                self.pending[request_id] = request
+            try:
+                getattr(self.ws_client, method)(id=request_id, **params)
+                request["sent"] = True
+            except Exception as e:
+                logger.error(f"WebSocket请求发送失败: {e}")
+                self.connected = False
+
+        deadline = time.time() + self.timeout
+        for request in requests_sent:
+            if request["sent"]:
+                request["event"].wait(max(deadline - time.time(), 0))
+            with self.lock:
+                self.pending.pop(request["id"], None)
+        return requests_sent
+
+    def place_orders(self, orders: list) -> list:
+        """
+        批量下单，orders为new_order参数列表，按顺序返回每个订单的下单结果，失败为None
+        每个订单必须带有newClientOrderId，未响应时按它确认订单是否存在
+        """
+        return [self.handle_order_result(request) for request in self.pipeline("new_order", orders)]
+
+    def handle_order_result(self, request: dict) -> Optional[dict]:
+        params = request["params"]
+        response = request["response"]
+        if response is not None:
+            if response.get("status") == 200:
+                logger.info(f"下单成功: {response['result']}|下单参数：{params}")
+                return response["result"]
+            if response.get("status", 0) < 500:
+                logger.error(f"WebSocket下单失败: {response.get('error')}|下单参数：{params}")
+                return None
+        # 没有响应或5xx时结果不确定，先确认订单是否存在，再通过REST用同一个newClientOrderId下单
+        return submit_order(params, confirm_first=request["sent"] or response is not None)
+
+    def replace_orders(self, orders: list) -> list:
+        """
+        批量撤单并下新单，orders为cancel_and_replace参数列表，
+        按顺序返回包含cancelResult和newOrderResult的结果，新订单必须带有newClientOrderId
+        """
+        return [self.handle_replace_result(request) for request in self.pipeline("cancel_replace_order", orders)]
+
+    def handle_replace_result(self, request: dict) -> dict:
+        params = request["params"]
+        response = request["response"]
+        if response is not None:
+            if response.get("status") == 200:
+                logger.info(f"改单成功: {response['result']}|改单参数：{params}")
+                return response["result"]
+            if response.get("status", 0) < 500:
+                error = response.get("error", {})
+                logger.error(f"WebSocket改单失败: {error}|改单参数：{params}")
+                return error.get("data") or {"cancelResult": "FAILURE", "newOrderResult": "NOT_ATTEMPTED"}
+        return cancel_and_replace(params, confirm_first=request["sent"] or response is not None)
+
+    def run(self):
+        """断线时重建连接"""
+        while True:
+            try:
+                if not self.connected:
+                    self.stop()
+                    self.start()
+            except Exception as e:
+                logger.error(f"WebSocket下单连接维护发生错误: {e}")
+                self.connected = False
+            time.sleep(5)
+
+order_gateway = WebsocketOrderGateway() if use_ws_order_api else None
+
+
+ORDER_NOT_EXIST = -2013  # 订单不存在的错误码
+UNKNOWN_ORDER = -2011  # 撤单时订单不存在或已不在挂单中
+# 执行结果未知的错误码：-1007等待撮合响应超时，-1021时间戳超出recvWindow（时钟已重新同步，订单未执行）
+RETRYABLE_ERRORS = (-1007, -1021)
+ORDER_RETRY_DELAY = 0.5  # 重试间隔秒数，逐次递增
+
+
+def client_order_id(tick: int, side: str) -> str:
+    """
+    点位和代次确定的newClientOrderId，代次为毫秒时间戳起的递增序号，重启后也不会与旧订单重复；
+    同一次下单的所有重试使用同一个ID，交易所只会接受一次
+    """
+    return f"grid-{tick}-{side[0]}-{next(order_generation)}"
+
+
+def parse_client_order_id(client_id: str) -> Optional[Tuple[int, str]]:
+    """从client_order_id生成的ID中取出(tick, 方向)，不是网格订单时返回None"""
+    parts = client_id.split("-")
+    if len(parts) != 4 or parts[0] != "grid" or not parts[1].isdigit() or parts[2] not in ("B", "S"):
+        return None
+    return int(parts[1]), "BUY" if parts[2] == "B" else "SELL"
+
+
+def find_order(params: dict) -> Optional[dict]:
+    """请求结果不确定时，按newClientOrderId确认订单是否已经存在"""
+    try:
+        order = spot_client.get_order(symbol=params["symbol"], origClientOrderId=params["newClientOrderId"])
+        logger.info(f"订单已存在: {order}")
+        return order
+    except ClientError as error:
+        if error.error_code != ORDER_NOT_EXIST:
+            raise
+    return None
+
+
+def is_uncertain(error: Exception) -> bool:
+    """超时、网络错误或5xx时订单可能已经执行，需要确认后再重试"""
+    if isinstance(error, ClientError):
+        return error.error_code in RETRYABLE_ERRORS or "Duplicate order" in str(error.error_message)
+    return isinstance(error, (ServerError, requests.exceptions.RequestException))
+
+
+def submit_order(params: dict, confirm_first: bool = False) -> Optional[dict]:
+    """
+    REST下单，结果不确定时先按newClientOrderId确认订单是否存在，不存在再用同一个ID重试
+    confirm_first为True表示此前已经发出过同一个订单
+    """
+    for attempt in range(order_retries + 1):
+        try:
+            if attempt > 0 or confirm_first:
+                order = find_order(params)
+                if order is not None:
+                    return order
+            response = spot_client.new_order(**params)
+            logger.info(f"下单成功: {response}|下单参数：{params}")
+            return response
+        except (ClientError, ServerError, requests.exceptions.RequestException) as error:
+            if not is_uncertain(error):
+                logger.error(
+                    "Found error. status: {}, error code: {}, error message: {}".format(
+                        error.status_code, error.error_code, error.error_message
+                    )
+                )
+                return None
+            logger.warning(f"下单结果不确定，第{attempt + 1}次: {error}|下单参数：{params}")
+            time.sleep(ORDER_RETRY_DELAY * (attempt + 1))
+    try:
+        return find_order(params)
+    except (ClientError, ServerError, requests.exceptions.RequestException) as error:
+        logger.error(f"无法确认订单是否存在: {error}|下单参数：{params}")
+    return None
+
+
+def cancel_and_replace(params: dict, confirm_first: bool = False) -> dict:
+    """
+    通过REST撤单并下新单，返回包含cancelResult和newOrderResult的结果
+    结果不确定时按新订单的newClientOrderId确认，STOP_ON_FAILURE模式下新订单存在说明撤单已经成功
+    """
+    failure = {"cancelResult": "FAILURE", "newOrderResult": "NOT_ATTEMPTED"}
+    for attempt in range(order_retries + 1):
+        try:
+            if attempt > 0 or confirm_first:
+                order = find_order(params)
+                if order is not None:
+                    return {"cancelResult": "SUCCESS", "newOrderResult": "SUCCESS", "newOrderResponse": order}
+            response = spot_client.cancel_and_replace(**params)
+            logger.info(f"改单成功: {response}|改单参数：{params}")
+            return response
+        except (ClientError, ServerError, requests.exceptions.RequestException) as error:
+            if not is_uncertain(error):
+                logger.error(
+                    "Found error. status: {}, error code: {}, error message: {}".format(
+                        error.status_code, error.error_code, error.error_message
+                    )
+                )
+                result = getattr(error, "error_data", None) or failure
+                # 此前结果不确定的请求可能已经撤单，旧订单不存在时确认它的状态
+                if (attempt > 0 or confirm_first) and is_unknown_order(error):
+                    return confirm_replace(params) or result
+                return result
+            logger.warning(f"改单结果不确定，第{attempt + 1}次: {error}|改单参数：{params}")
+            time.sleep(ORDER_RETRY_DELAY * (attempt + 1))
+    return confirm_replace(params) or failure
+
 
+def is_unknown_order(error: ClientError) -> bool:
+    """撤单的订单不存在，cancelReplace把撤单的错误放在data.cancelResponse中"""
+    cancel_response = (error.error_data or {}).get("cancelResponse") or {}
+    return UNKNOWN_ORDER in (error.error_code, cancel_response.get("code"))
+
+
+def confirm_replace(params: dict) -> Optional[dict]:
+    """
+    改单结果不确定时，按新订单的newClientOrderId和旧订单的状态确认结果，无法确认时返回None
+    旧订单已撤销而新订单不存在时单独补下新订单
+    """
+    try:
+        order = find_order(params)
+        if order is not None:
+            return {"cancelResult": "SUCCESS", "newOrderResult": "SUCCESS", "newOrderResponse": order}
+        old_order = spot_client.get_order(symbol=params["symbol"], orderId=params["cancelOrderId"])
+    except (ClientError, ServerError, requests.exceptions.RequestException) as error:
+        logger.error(f"无法确认改单结果: {error}|改单参数：{params}")
+        return None
+    if old_order["status"] != "CANCELED":
+        return None
+    new_params = {key: value for key, value in params.items() if key not in ("cancelReplaceMode", "cancelOrderId")}
+    order = submit_order(new_params)
+    return {
+        "cancelResult": "SUCCESS",
+        "newOrderResult": "SUCCESS" if order else "FAILURE",
+        "newOrderResponse": order,
+    }
 
 
 class BalanceManager:
@@ -94,10 +620,10 @@ class BalanceManager:
     def calculate_total_required_balance(self):
         """计算所有品种balance_buffer个interval所需的总资金"""
         total_required = 0
-        for symbol, config in CONFIG["SYMBOLS"].items():
+        for symbol, config in list(CONFIG["SYMBOLS"].items()):
             # 获取当前价格
             try:
-                current_price = float(spot_client.ticker_price(symbol)["price"])
+                current_price = price_cache.get_price(symbol)
                 
                 # 如果当前价格高于base_price，跳过该品种
                 if current_price >= config["BASE_PRICE"]:
@@ -160,62 +686,234 @@ class BalanceManager:
                 except Exception as e:
                     logger.error(f"存入理财失败: {e}")
 
+class UserDataStream:
+    """
+    用户数据流：通过listenKey订阅executionReport，订单成交后立即回调对应品种的策略
+    """
+    RENEW_INTERVAL = 30 * 60  # listenKey有效期为60分钟，每30分钟续期一次
+
+    def __init__(self):
+        self.handlers: Dict[str, "UsdcArbitrage"] = {}  # symbol -> 策略实例
+        self.listen_key = None
+        self.ws_client = None
+        self.connected = False
+        self.last_renew = 0
+
+    def register(self, arbitrage: "UsdcArbitrage"):
+        self.handlers[arbitrage.symbol] = arbitrage
+
+    def unregister(self, symbol: str):
+        self.handlers.pop(symbol, None)
+
+    def start(self):
+        """申请listenKey并建立websocket连接"""
+        self.listen_key = spot_client.new_listen_key()["listenKey"]
+        self.ws_client = SpotWebsocketStreamClient(
+            on_message=self.on_message,
+            on_close=self.on_close,
+            on_error=self.on_error,
+            reconnect=True,
+            parse_json=True,
+            # 成交回调会下单，放到工作线程执行，避免阻塞读取和心跳；成交回报不能丢，队列满时阻塞
+            dispatcher=MessageDispatcher(policy=MessageDispatcher.BLOCK),
+        )
+        self.ws_client.user_data(self.listen_key)
+        self.last_renew = time.time()
+        self.connected = True
+        logger.info("用户数据流已连接")
+
+    def stop(self):
+        if self.ws_client:
+            try:
+                self.ws_client.stop()
+            except Exception as e:
+                logger.error(f"关闭用户数据流失败: {e}")
+        self.ws_client = None
+        self.connected = False
+
+    def on_message(self, _, data):
+        event_type = data.get("e")
+        if event_type == "executionReport":
+            handler = self.handlers.get(data.get("s"))
+            if handler:
+                handler.on_execution_report(data)
+        elif event_type == "listenKeyExpired":
+            logger.warning("listenKey已过期，准备重新连接用户数据流")
+            self.connected = False
+
+    def on_close(self, _):
+        logger.warning("用户数据流连接已关闭")
+        self.connected = False
+
+    def on_error(self, _, error):
+        # 客户端会自动重连并重新订阅listenKey，断线期间的成交由定期对账补齐
+        logger.error(f"用户数据流发生错误，等待重连: {error}")
+
+    def keepalive(self):
+        """listenKey过期或客户端停止时重建连接，否则定期续期listenKey"""
+        if not self.connected or not self.ws_client.socket_manager.is_alive():
+            self.stop()
+            self.start()
+        elif time.time() - self.last_renew >= self.RENEW_INTERVAL:
+            spot_client.renew_listen_key(self.listen_key)
+            self.last_renew = time.time()
+            logger.info("listenKey续期成功")
+
+    def run(self):
+        while True:
+            try:
+                self.keepalive()
+            except Exception as e:
+                logger.error(f"用户数据流维护发生错误: {e}")
+                self.connected = False
+            time.sleep(60)
+
+
 class UsdcArbitrage:
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, event_driven: bool = False):
         self.symbol = symbol
         self.config = CONFIG["SYMBOLS"][symbol]  # 获取该品种的具体配置
-        self.position_map: Dict[float, OrderInfo] = {}
+        self.position_map: Dict[int, OrderInfo] = {}  # tick -> 点位信息
+        self.order_index: Dict[int, int] = {}  # orderId -> tick
         self.current_base_price = self.config["BASE_PRICE"]  # 添加当前base_price变量
+        self.load_state()
+        # 事件驱动模式下成交由用户数据流推送，REST仅用于定期对账
+        self.event_driven = event_driven
+        self.last_price = None  # 最近一次获取的价格，供成交回调使用
+        self.last_reconcile = 0
+        self.adopted = False  # 是否已接管状态库中没有记录的挂单
+        # 用户数据流线程与轮询线程都会修改position_map
+        self.lock = threading.RLock()
 
-    # 批量获取订单
-    def get_open_orders(self):
-        try:
-            response = spot_client.get_open_orders(self.symbol)
-            # logger.info(response)
-            return response
-        except ClientError as error:
-            logger.error(
-                "Found error. status: {}, error code: {}, error message: {}".format(
-                    error.status_code, error.error_code, error.error_message
-                )
+    def load_state(self):
+        """从状态库恢复点位和base_price，首次对账时再与交易所挂单核对"""
+        if grid_store is None:
+            return
+        base_price = grid_store.load_base_price(self.symbol)
+        if base_price is not None:
+            self.current_base_price = base_price
+        for tick, level in grid_store.load_levels(self.symbol).items():
+            order_info = OrderInfo(
+                entry_order_id=level["entry_order_id"],
+                exit_order_id=level["exit_order_id"],
+                status=OrderStatus[level["status"]],
+                entry_price=level["entry_price"],
+                exit_price=level["exit_price"],
             )
+            self.position_map[tick] = order_info
+            self.index_level(tick, order_info)
+        if self.position_map:
+            logger.info(f"{self.symbol}从状态库恢复{len(self.position_map)}个点位, base_price: {self.current_base_price}")
 
-    def place_limit_order(self, price: float, amount: float, side: str) -> str:
-        """
-        下限价单（示例实现）
-        """
-        params = {
+    def index_level(self, tick: int, order_info: OrderInfo):
+        for order_id in (order_info.entry_order_id, order_info.exit_order_id):
+            if order_id is not None:
+                self.order_index[order_id] = tick
+
+    def unindex_level(self, order_info: OrderInfo):
+        for order_id in (order_info.entry_order_id, order_info.exit_order_id):
+            if order_id is not None:
+                self.order_index.pop(order_id, None)
+
+    def set_level(self, tick: int, order_info: OrderInfo):
+        """写入点位并同步到订单索引和状态库"""
+        old_order_info = self.position_map.get(tick)
+        if old_order_info is not None and old_order_info is not order_info:
+            self.unindex_level(old_order_info)
+        self.position_map[tick] = order_info
+        self.index_level(tick, order_info)
+        if grid_store is not None:
+            grid_store.save_level(
+                self.symbol, tick, order_info.entry_order_id, order_info.exit_order_id,
+                order_info.status.name, order_info.entry_price, order_info.exit_price,
+            )
+
+    def remove_level(self, tick: int):
+        """删除点位并同步到订单索引和状态库"""
+        self.unindex_level(self.position_map.pop(tick))
+        if grid_store is not None:
+            grid_store.delete_level(self.symbol, tick)
+
+    # 批量获取订单
+    def get_open_orders(self) -> Optional[Dict[int, dict]]:
+        """返回以orderId为键的挂单索引"""
+        return open_order_snapshot.get(self.symbol)
+
+    def limit_order_params(self, price: float, amount: float, side: str) -> dict:
+        return {
             "symbol": self.symbol,
             "side": side,
             "type": "LIMIT",
             "timeInForce": "GTC",
             "quantity": amount,
             "price": price,
+            "newClientOrderId": client_order_id(price_to_tick(price), side),
         }
 
+    def place_limit_order(self, price: float, amount: float, side: str) -> Optional[int]:
+        """
+        下限价单，超时或5xx时用同一个newClientOrderId安全重试
+        """
+        response = submit_order(self.limit_order_params(price, amount, side))
+        return response["orderId"] if response else None
+
+    def place_limit_orders(self, orders: list) -> list:
+        """
+        批量下限价单，orders为(price, amount, side)列表，按顺序返回订单ID，失败为None
+        开启WebSocket下单时所有订单在一个往返内发出
+        """
+        if order_gateway is None:
+            return [self.place_limit_order(price=price, amount=amount, side=side) for price, amount, side in orders]
+        results = order_gateway.place_orders([self.limit_order_params(*order) for order in orders])
+        return [result["orderId"] if result else None for result in results]
+
+    def replace_limit_orders(self, orders: list) -> list:
+        """
+        批量改单，orders为(旧订单ID, 新价格, 数量, 方向)列表，每个点位撤单和下单在一个请求内完成，
+        开启WebSocket下单时所有改单在一个往返内发出
+        """
+        params_list = [
+            {
+                **self.limit_order_params(price, amount, side),
+                "cancelReplaceMode": "STOP_ON_FAILURE",
+                "cancelOrderId": order_id,
+            }
+            for order_id, price, amount, side in orders
+        ]
+        if order_gateway is None:
+            return [cancel_and_replace(params) for params in params_list]
+        return order_gateway.replace_orders(params_list)
+
+    def resolve_orders(self, order_ids: list) -> Dict[int, dict]:
+        """
+        不在挂单快照中的订单（已成交或已撤销）通过一次get_orders批量查询
+        """
+        resolved: Dict[int, dict] = {}
+        if not order_ids:
+            return resolved
         try:
-            response = spot_client.new_order(**params)
-            if response:
-                logger.info(f"下单成功: {response}|下单参数：{params}")
-                return response["orderId"]
-            # logger.info(response)
+            orders = spot_client.get_orders(symbol=self.symbol, orderId=min(order_ids), limit=1000)
+            for order in orders:
+                resolved[order["orderId"]] = order
         except ClientError as error:
             logger.error(
-                "Found error. status: {}, error code: {}, error message: {}".format(
+                "批量查询订单出错. status: {}, error code: {}, error message: {}".format(
                     error.status_code, error.error_code, error.error_message
                 )
             )
-        return None
+        return resolved
 
-    def check_order_status(self, order_id: str, order_list: list) -> bool:
+    def check_order_status(self, order_id: int, open_orders: Dict[int, dict], resolved: Dict[int, dict]) -> bool:
         """
-        从order_list中检查订单是否成交
+        从挂单索引和批量查询结果中检查订单是否成交
         """
-        for order in order_list:
-            if str(order["orderId"]) == str(order_id):
-                return order["status"] == "FILLED"
+        if order_id is None:
+            return False
+        order = open_orders.get(order_id) or resolved.get(order_id)
+        if order is not None:
+            return order["status"] == "FILLED"
             
-        # 如果在order_list中没找到订单,通过API查询订单状态
+        # 批量查询结果中也没有该订单（超出1000条），单独查询订单状态
         try:
             order_status = spot_client.get_order(symbol=self.symbol, orderId=order_id)
             logger.info(f"查询订单状态: {order_status}")
@@ -232,10 +930,9 @@ class UsdcArbitrage:
         """
         获取当前USDC价格
         """
-        response = spot_client.ticker_price(self.symbol)
-        return float(response["price"])
+        return price_cache.get_price(self.symbol)
 
-    def cancel_order(self, order_id: str):
+    def cancel_order(self, order_id: int):
         """撤销订单"""
         try:
             response = spot_client.cancel_order(symbol=self.symbol, orderId=order_id)
@@ -253,90 +950,310 @@ class UsdcArbitrage:
         if current_price > self.current_base_price:
             old_base_price = self.current_base_price
             self.current_base_price = current_price
+            if grid_store is not None:
+                grid_store.save_base_price(self.symbol, current_price)
             logger.info(f"{self.symbol} base_price从{old_base_price}上移至{current_price}")
             
             # 撤销距离新base_price过远的订单
-            for price, order_info in list(self.position_map.items()):
-                if price <= self.current_base_price - (balance_buffer * self.config["PRICE_INTERVAL"]):
-                    if order_info.status == OrderStatus.ENTRY_PLACED:
-                        if self.cancel_order(order_info.entry_order_id):
-                            del self.position_map[price]
-                    elif order_info.status == OrderStatus.WAITING_PROFIT:
-                        if self.cancel_order(order_info.exit_order_id):
-                            del self.position_map[price]
+            self.drop_far_exit_levels()
+            far_tick = self.far_tick()
+            self.shift_far_entries(
+                [tick for tick, order_info in self.position_map.items()
+                 if tick <= far_tick and order_info.status == OrderStatus.ENTRY_PLACED],
+                current_price,
+            )
 
-    def place_entry_orders(self, current_price: float):
+    def drop_far_exit_levels(self):
+        """撤销过远点位的止盈单并删除点位"""
+        far_tick = self.far_tick()
+        for tick, order_info in list(self.position_map.items()):
+            if tick <= far_tick and order_info.status == OrderStatus.WAITING_PROFIT:
+                # 止盈单尚未挂出时无需撤单
+                if order_info.exit_order_id is None or self.cancel_order(order_info.exit_order_id):
+                    self.remove_level(tick)
+
+    def shift_far_entries(self, far_entry_ticks: list, current_price: float):
+        """过远的入场单直接改价到新base_price附近的空缺点位，撤单和下单在同一个请求内完成"""
+        replacements = list(zip(far_entry_ticks, self.entry_ticks_to_place(current_price)))
+        if replacements:
+            results = self.replace_limit_orders([
+                (self.position_map[old_tick].entry_order_id, tick_to_price(new_tick), self.config["ORDER_AMOUNT"], "BUY")
+                for old_tick, new_tick in replacements
+            ])
+            for (old_tick, new_tick), result in zip(replacements, results):
+                if result.get("cancelResult") == "SUCCESS":
+                    self.remove_level(old_tick)
+                if result.get("newOrderResult") == "SUCCESS":
+                    self.set_level(new_tick, self.new_entry_level(new_tick, result["newOrderResponse"]["orderId"]))
+
+        # 没有空缺点位可以改价的入场单直接撤销
+        for tick in far_entry_ticks[len(replacements):]:
+            if self.cancel_order(self.position_map[tick].entry_order_id):
+                self.remove_level(tick)
+
+    def far_tick(self) -> int:
+        """低于或等于该tick的点位距离base_price过远"""
+        return price_to_tick(self.current_base_price) - balance_buffer * price_to_tick(self.config["PRICE_INTERVAL"])
+
+    def new_entry_level(self, tick: int, entry_order_id: Optional[int]) -> OrderInfo:
+        return OrderInfo(
+            entry_order_id=entry_order_id,
+            entry_price=tick_to_price(tick),
+            exit_price=tick_to_price(tick + price_to_tick(self.config["PROFIT_INTERVAL"])),
+            status=OrderStatus.ENTRY_PLACED
+        )
+
+    def entry_ticks_to_place(self, current_price: float) -> list:
+        """返回需要挂入场单的点位，从base_price开始向下排列"""
+        ticks = []
+        base_tick = price_to_tick(self.current_base_price)
+        interval_ticks = price_to_tick(self.config["PRICE_INTERVAL"])
+        far_tick = self.far_tick()
         for i in range(self.config["MAX_ORDERS"]):
-            price = math.floor((self.current_base_price - i * self.config["PRICE_INTERVAL"]) * 10000) / 10000  # 使用current_base_price
+            tick = base_tick - i * interval_ticks  # 使用current_base_price
             
-            if price > current_price:
+            if tick_to_price(tick) > current_price:
                 continue
                 
-            if price <= self.current_base_price - (balance_buffer * self.config["PRICE_INTERVAL"]):  # 使用current_base_price
+            if tick <= far_tick:
                 break
             
             # 只有在无订单状态下才需要挂入场单
-            if price not in self.position_map or self.position_map[price].status == OrderStatus.NO_ORDER:
-                order_info = OrderInfo()
-                order_id = self.place_limit_order(price=price, amount=self.config["ORDER_AMOUNT"], side="BUY")
-                order_info.entry_order_id = order_id
-                order_info.entry_price = price
-                order_info.exit_price = price + self.config["PROFIT_INTERVAL"]
-                order_info.status = OrderStatus.ENTRY_PLACED
-                self.position_map[price] = order_info
-
-    def check_and_update_orders(self):
+            if tick not in self.position_map or self.position_map[tick].status == OrderStatus.NO_ORDER:
+                ticks.append(tick)
+        return ticks
+
+    def place_entry_orders(self, current_price: float):
+        ticks = self.entry_ticks_to_place(current_price)
+        if not ticks:
+            return
+        order_ids = self.place_limit_orders([(tick_to_price(tick), self.config["ORDER_AMOUNT"], "BUY") for tick in ticks])
+        for tick, order_id in zip(ticks, order_ids):
+            # 下单失败的点位不写入，下一轮重新挂单
+            if order_id is not None:
+                self.set_level(tick, self.new_entry_level(tick, order_id))
+
+    def place_exit_orders(self):
+        """为入场单已成交但止盈单下单失败的点位重新挂止盈单"""
+        for tick, order_info in list(self.position_map.items()):
+            if order_info.status == OrderStatus.WAITING_PROFIT and order_info.exit_order_id is None:
+                self.place_exit_order(tick, order_info)
+
+    def place_exit_order(self, tick: int, order_info: OrderInfo):
+        exit_order_id = self.place_limit_order(
+            price=order_info.exit_price,
+            amount=self.config["ORDER_AMOUNT"],
+            side="SELL"
+        )
+        if exit_order_id is None:
+            return
+        order_info.exit_order_id = exit_order_id
+        self.set_level(tick, order_info)
+        logger.info(f"设置止盈单: {exit_order_id}")
+
+    def on_entry_filled(self, tick: int, order_info: OrderInfo):
+        """入场订单成交，设置止盈单，下单失败时由place_exit_orders重试"""
+        order_info.exit_order_id = None
+        order_info.status = OrderStatus.WAITING_PROFIT
+        self.set_level(tick, order_info)
+        self.place_exit_order(tick, order_info)
+
+    def on_exit_filled(self, tick: int, order_info: OrderInfo, current_price: float):
+        """止盈单成交，重置该点位"""
+        send_wx_notification(title="止盈单成交", message=f"止盈单成交: {order_info.exit_order_id}")
+        if current_price is not None and current_price >= order_info.entry_price:
+            # 如果当前价格高于入场价，可以重新布局入场单
+            new_entry_order_id = self.place_limit_order(
+                price=order_info.entry_price, 
+                amount=self.config["ORDER_AMOUNT"], 
+                side="BUY"
+            )
+            if new_entry_order_id is not None:
+                self.set_level(tick, self.new_entry_level(tick, new_entry_order_id))
+                return
+        # 否则删除该点位信息，下单失败时由place_entry_orders重新挂单
+        self.remove_level(tick)
+
+    def on_execution_report(self, event: dict):
+        """
+        处理用户数据流推送的executionReport，订单完全成交后立即处理止盈或重新入场
+        """
+        if event.get("X") != "FILLED":
+            return
+        order_id = event["i"]
+        with self.lock:
+            tick = self.order_index.get(order_id)
+            if tick is None:
+                return
+            order_info = self.position_map[tick]
+            if order_info.status == OrderStatus.ENTRY_PLACED and order_info.entry_order_id == order_id:
+                logger.info(f"{self.symbol}入场单成交推送: {order_id}")
+                self.on_entry_filled(tick, order_info)
+            elif order_info.status == OrderStatus.WAITING_PROFIT and order_info.exit_order_id == order_id:
+                logger.info(f"{self.symbol}止盈单成交推送: {order_id}")
+                self.on_exit_filled(tick, order_info, self.last_price)
+
+    def check_and_update_orders(self, reconcile: bool = True):
+        """
+        reconcile为False时只更新价格与入场单，订单状态由用户数据流推送
+        """
         current_price = self.get_current_price()
-        self.update_base_price(current_price)  # 添加base_price更新逻辑
-        order_list = self.get_open_orders()
+        with self.lock:
+            self.last_price = current_price
+            self.update_base_price(current_price)  # 添加base_price更新逻辑
+            if reconcile:
+                self.reconcile_orders(current_price)
+            self.place_exit_orders()
+            self.place_entry_orders(current_price)
+
+    @staticmethod
+    def live_order_id(order_info: OrderInfo) -> Optional[int]:
+        """点位当前等待成交的订单ID"""
+        if order_info.status == OrderStatus.ENTRY_PLACED:
+            return order_info.entry_order_id
+        if order_info.status == OrderStatus.WAITING_PROFIT:
+            return order_info.exit_order_id
+        return None
+
+    def adopt_orders(self, open_orders: Dict[int, dict]):
+        """
+        接管状态库中没有记录的网格挂单：下单成功后、写入状态库前进程退出时，
+        按newClientOrderId中的tick和方向还原点位，止盈单按当前PROFIT_INTERVAL推算入场点位
+        """
+        profit_ticks = price_to_tick(self.config["PROFIT_INTERVAL"])
+        for order_id, order in open_orders.items():
+            parsed = parse_client_order_id(order.get("clientOrderId", ""))
+            if order_id in self.order_index or parsed is None:
+                continue
+            tick, side = parsed
+            entry_tick = tick if side == "BUY" else tick - profit_ticks
+            order_info = self.position_map.get(entry_tick)
+            if order_info is not None and self.live_order_id(order_info) in open_orders:
+                # 点位已有挂单，重复的订单直接撤销
+                logger.warning(f"{self.symbol}点位{entry_tick}已有挂单，撤销重复订单: {order_id}")
+                self.cancel_order(order_id)
+                continue
+            if side == "BUY":
+                order_info = self.new_entry_level(entry_tick, order_id)
+            else:
+                order_info = OrderInfo(
+                    entry_order_id=order_info.entry_order_id if order_info is not None else None,
+                    exit_order_id=order_id,
+                    status=OrderStatus.WAITING_PROFIT,
+                    entry_price=tick_to_price(entry_tick),
+                    exit_price=tick_to_price(tick),
+                )
+            logger.info(f"{self.symbol}接管挂单: {order_id}, 点位: {entry_tick}")
+            self.set_level(entry_tick, order_info)
+
+    def reconcile_orders(self, current_price: float):
+        """通过REST查询挂单，处理所有已成交的订单"""
+        open_orders = self.get_open_orders()
+        if open_orders is None:
+            return
+        if not self.adopted:
+            self.adopt_orders(open_orders)
+            self.adopted = True
+
+        missing_order_ids = []
+        for order_info in self.position_map.values():
+            order_id = self.live_order_id(order_info)
+            if order_id is not None and order_id not in open_orders:
+                missing_order_ids.append(order_id)
+        resolved = self.resolve_orders(missing_order_ids)
         
-        for price, order_info in list(self.position_map.items()):
+        for tick, order_info in list(self.position_map.items()):
             # 检查入场订单是否成交
             if order_info.status == OrderStatus.ENTRY_PLACED:
-                if self.check_order_status(order_id=order_info.entry_order_id, order_list=order_list):
-                    # 入场订单成交，设置止盈单
-                    exit_order_id = self.place_limit_order(
-                        price=order_info.exit_price, 
-                        amount=self.config["ORDER_AMOUNT"], 
-                        side="SELL"
-                    )
-                    order_info.exit_order_id = exit_order_id
-                    order_info.status = OrderStatus.WAITING_PROFIT
-                    logger.info(f"设置止盈单: {exit_order_id}")
+                if self.check_order_status(order_info.entry_order_id, open_orders, resolved):
+                    self.on_entry_filled(tick, order_info)
             # 检查出场订单是否成交
             elif order_info.status == OrderStatus.WAITING_PROFIT:
-                if self.check_order_status(order_id=order_info.exit_order_id, order_list=order_list):
-                    send_wx_notification(title="止盈单成交", message=f"止盈单成交: {order_info.exit_order_id}")
-                    # 止盈单成交，重置该点位
-                    if current_price >= price:
-                        # 如果当前价格高于入场价，可以重新布局入场单
-                        new_entry_order_id = self.place_limit_order(
-                            price=price, 
-                            amount=self.config["ORDER_AMOUNT"], 
-                            side="BUY"
-                        )
-                        self.position_map[price] = OrderInfo(
-                            entry_order_id=new_entry_order_id,
-                            entry_price=price,
-                            exit_price=price + self.config["PROFIT_INTERVAL"],
-                            status=OrderStatus.ENTRY_PLACED
-                        )
-                    else:
-                        # 否则删除该点位信息
-                        del self.position_map[price]
+                if self.check_order_status(order_info.exit_order_id, open_orders, resolved):
+                    self.on_exit_filled(tick, order_info, current_price)
+        self.last_reconcile = time.time()
 
-        self.place_entry_orders(current_price)
-    def run(self):
+    def run(self, stop_event: Optional[threading.Event] = None):
         """
-        运行策略
+        运行策略，stop_event被设置后退出
         """
-        while True:
+        if stop_event is None:
+            stop_event = threading.Event()
+        while not stop_event.is_set():
             try:
-                self.check_and_update_orders()
-                time.sleep(1)  # 每秒检查一次
+                # 事件驱动模式下每隔reconcile_interval秒对账一次，否则每秒对账
+                reconcile = not self.event_driven or time.time() - self.last_reconcile >= reconcile_interval
+                self.check_and_update_orders(reconcile=reconcile)
+                stop_event.wait(1)  # 每秒检查一次
             except Exception as e:
                 logger.error(f"发生错误: {e}")
-                time.sleep(1)
+                stop_event.wait(1)
+        logger.info(f"{self.symbol}策略已停止")
+
+
+class GridScheduler:
+    """
+    多品种调度器：每个品种在独立线程中并发运行，共享spot_client的HTTP会话和请求权重预算，
+    定期重新加载config.py，无需重启即可增删品种
+    """
+    def __init__(self, user_data_stream: Optional[UserDataStream] = None):
+        self.user_data_stream = user_data_stream
+        self.instances: Dict[str, UsdcArbitrage] = {}
+        self.stop_events: Dict[str, threading.Event] = {}
+        self.threads: Dict[str, threading.Thread] = {}
+
+    def add_symbol(self, symbol: str):
+        arbitrage = UsdcArbitrage(symbol=symbol, event_driven=self.user_data_stream is not None)
+        stop_event = threading.Event()
+        thread = threading.Thread(target=arbitrage.run, args=(stop_event,), name=f"grid-{symbol}", daemon=True)
+        self.instances[symbol] = arbitrage
+        self.stop_events[symbol] = stop_event
+        self.threads[symbol] = thread
+        if self.user_data_stream:
+            self.user_data_stream.register(arbitrage)
+        thread.start()
+        logger.info(f"启动{symbol}策略")
+
+    def remove_symbol(self, symbol: str):
+        """停止该品种的策略，已挂出的订单保留在交易所"""
+        if self.user_data_stream:
+            self.user_data_stream.unregister(symbol)
+        self.stop_events.pop(symbol).set()
+        self.threads.pop(symbol).join()
+        del self.instances[symbol]
+        logger.info(f"移除{symbol}策略")
+
+    def reload_config(self):
+        """重新加载config.py中的SYMBOLS配置"""
+        try:
+            importlib.reload(config_module)
+        except Exception as e:
+            logger.error(f"重新加载配置失败: {e}")
+            return
+        symbols = config_module.CONFIG["SYMBOLS"]
+        CONFIG["SYMBOLS"] = symbols
+        for symbol, arbitrage in self.instances.items():
+            if symbol in symbols:
+                arbitrage.config = symbols[symbol]
+
+    def sync_symbols(self):
+        symbols = CONFIG["SYMBOLS"]
+        for symbol in list(self.instances.keys()):
+            if symbol not in symbols:
+                self.remove_symbol(symbol)
+        for symbol in symbols.keys():
+            if symbol not in self.instances:
+                self.add_symbol(symbol)
+
+    def run(self):
+        self.sync_symbols()
+        while True:
+            time.sleep(config_reload_interval)
+            try:
+                self.reload_config()
+                self.sync_symbols()
+            except Exception as e:
+                logger.error(f"调度器发生错误: {e}")
 
 
 # 启动余额管理
@@ -350,20 +1267,34 @@ def manage_balance_thread():
             time.sleep(5)
 
 if __name__ == "__main__":
+    # 打开网格状态库，各品种启动时从中恢复点位
+    if CONFIG.get("STATE_DB"):
+        grid_store = GridStateStore(CONFIG["STATE_DB"])
+
     # 初始化余额管理器
     balance_manager = BalanceManager()
-    arbitrage_instances = []
 
-    # 初始化所有symbol的策略
-    for symbol in CONFIG["SYMBOLS"].keys():
-        arbitrage = UsdcArbitrage(symbol=symbol)
-        arbitrage_instances.append(arbitrage)
+    # 启动用户数据流线程，成交推送直接触发止盈和重新入场
+    user_data_stream = None
+    if use_user_data_stream:
+        user_data_stream = UserDataStream()
+        user_stream_thread = threading.Thread(target=user_data_stream.run, daemon=True)
+        user_stream_thread.start()
+
+    # 启动盘口价格推送线程，价格读取不再经过REST
+    if use_book_ticker_stream:
+        price_thread = threading.Thread(target=price_cache.run, daemon=True)
+        price_thread.start()
 
+    # 启动WebSocket下单连接线程，整个网格的入场单在一个往返内发出
+    if order_gateway is not None:
+        order_gateway_thread = threading.Thread(target=order_gateway.run, daemon=True)
+        order_gateway_thread.start()
 
     # 启动余额管理线程
     balance_thread = threading.Thread(target=manage_balance_thread, daemon=True)
     balance_thread.start()
 
-    # 运行所有策略
-    for arbitrage in arbitrage_instances:
-        arbitrage.run()
+    # 并发运行所有品种的策略
+    scheduler = GridScheduler(user_data_stream=user_data_stream)
+    scheduler.run()
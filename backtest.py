@@ -0,0 +1,343 @@
+"""
+网格策略回测：将本地保存的klines或aggTrades数据逐条回放给UsdcArbitrage，
+由SimulatedExchange模拟撮合，不访问网络
+
+用法:
+    python backtest.py FDUSDUSDT-1s-2024-01.csv --symbol FDUSDUSDT --base-price 0.9984
+"""
+import argparse
+import csv
+import json
+import logging
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import arbitrage
+from binance.error import ClientError
+
+# 每条行情统一为 (时间戳毫秒, 最低价, 最高价, 收盘价)
+Tick = Tuple[int, float, float, float]
+
+
+def load_market_data(path: str) -> List[Tick]:
+    """
+    读取本地行情文件，支持:
+    - Spot.klines返回格式的JSON，或Binance历史数据的klines CSV（12列）
+    - Spot.agg_trades返回格式的JSON，或Binance历史数据的aggTrades CSV（7或8列）
+    """
+    rows: List[Tick] = []
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        for item in data:
+            if isinstance(item, dict):
+                price = float(item["p"])
+                rows.append((int(item["T"]), price, price, price))
+            else:
+                rows.append((int(item[0]), float(item[3]), float(item[2]), float(item[4])))
+        return rows
+
+    with open(path, "r", newline="") as f:
+        for record in csv.reader(f):
+            if not record or not record[0].isdigit():
+                continue  # 跳过表头
+            if len(record) >= 12:
+                rows.append((int(record[0]), float(record[3]), float(record[2]), float(record[4])))
+            else:
+                price = float(record[1])
+                rows.append((int(record[5]), price, price, price))
+    return rows
+
+
+class SimulatedExchange:
+    """
+    模拟交易所：实现UsdcArbitrage用到的Spot接口，按行情的最高价和最低价撮合挂单
+
+    fill_model为"through"时价格必须穿过挂单价才成交，为"touch"时触及即成交
+    """
+    INSUFFICIENT_BALANCE = -2010
+    ORDER_NOT_EXIST = -2013
+
+    def __init__(self, symbol: str, quote_balance: Optional[float] = None, fee_rate: float = 0.0,
+                 fill_model: str = "through"):
+        self.symbol = symbol
+        self.quote_balance = quote_balance  # None表示资金不限
+        self.fee_rate = fee_rate
+        self.fill_model = fill_model
+        self.orders: Dict[int, dict] = {}
+        self.open_orders: Dict[int, dict] = {}
+        self.client_order_ids: Dict[str, int] = {}
+        self.next_order_id = 1
+        self.last_price = 0.0
+        self.now = 0
+        self.version = 0  # 挂单发生变化时递增
+        self.quote = 0.0  # 已实现的报价资产变化
+        self.base = 0.0  # 持有的基础资产数量
+        self.entry_fills = 0
+        self.exit_fills = 0
+
+    def locked_quote(self) -> float:
+        return sum(o["price"] * o["quantity"] for o in self.open_orders.values() if o["side"] == "BUY")
+
+    def inventory(self) -> float:
+        """持仓数量，包括卖单冻结的部分"""
+        return self.base + sum(o["quantity"] for o in self.open_orders.values() if o["side"] == "SELL")
+
+    def capital_in_use(self) -> float:
+        """买单冻结的资金加上持仓按当前价计算的价值"""
+        return self.locked_quote() + self.inventory() * self.last_price
+
+    def _order_response(self, order: dict) -> dict:
+        return {
+            "symbol": order["symbol"],
+            "orderId": order["orderId"],
+            "clientOrderId": order["clientOrderId"],
+            "price": str(order["price"]),
+            "origQty": str(order["quantity"]),
+            "status": order["status"],
+            "side": order["side"],
+            "type": "LIMIT",
+            "time": order["time"],
+        }
+
+    # 以下为UsdcArbitrage调用的Spot接口
+    def ticker_price(self, symbol: str = None, symbols: list = None):
+        if symbols is not None:
+            return [{"symbol": s, "price": str(self.last_price)} for s in symbols]
+        return {"symbol": symbol, "price": str(self.last_price)}
+
+    def new_order(self, symbol: str, side: str, type: str, quantity: float, price: float,
+                  newClientOrderId: str = None, **kwargs):
+        if side == "BUY" and self.quote_balance is not None:
+            if self.quote_balance + self.quote - self.locked_quote() < price * quantity:
+                raise ClientError(400, self.INSUFFICIENT_BALANCE, "Account has insufficient balance for requested action.", {})
+        if side == "SELL" and self.base < quantity - 1e-12:
+            raise ClientError(400, self.INSUFFICIENT_BALANCE, "Account has insufficient balance for requested action.", {})
+        order_id = self.next_order_id
+        self.next_order_id += 1
+        order = {
+            "symbol": symbol,
+            "orderId": order_id,
+            "clientOrderId": newClientOrderId or f"sim{order_id}",
+            "side": side,
+            "price": float(price),
+            "quantity": float(quantity),
+            "status": "NEW",
+            "time": self.now,
+        }
+        if side == "SELL":
+            self.base -= quantity  # 卖单冻结基础资产
+        self.orders[order_id] = order
+        self.open_orders[order_id] = order
+        self.client_order_ids[order["clientOrderId"]] = order_id
+        self.version += 1
+        return self._order_response(order)
+
+    def cancel_order(self, symbol: str, orderId: int = None, **kwargs):
+        order = self.open_orders.pop(orderId, None)
+        if order is None:
+            raise ClientError(400, -2011, "Unknown order sent.", {})
+        order["status"] = "CANCELED"
+        if order["side"] == "SELL":
+            self.base += order["quantity"]
+        self.version += 1
+        return self._order_response(order)
+
+    def cancel_and_replace(self, symbol: str, side: str, type: str, cancelReplaceMode: str,
+                           cancelOrderId: int = None, **kwargs):
+        try:
+            cancel_response = self.cancel_order(symbol, orderId=cancelOrderId)
+        except ClientError as error:
+            raise ClientError(400, -2022, "Order cancel-replace failed.", {},
+                              {"cancelResult": "FAILURE", "newOrderResult": "NOT_ATTEMPTED",
+                               "cancelResponse": {"code": error.error_code, "msg": error.error_message}})
+        try:
+            new_order_response = self.new_order(symbol, side, type, **kwargs)
+        except ClientError:
+            raise ClientError(409, -2021, "Order cancel-replace partially failed.", {},
+                              {"cancelResult": "SUCCESS", "newOrderResult": "FAILURE"})
+        return {
+            "cancelResult": "SUCCESS",
+            "newOrderResult": "SUCCESS",
+            "cancelResponse": cancel_response,
+            "newOrderResponse": new_order_response,
+        }
+
+    def get_open_orders(self, symbol: str = None, **kwargs):
+        return [self._order_response(o) for o in self.open_orders.values()]
+
+    def get_orders(self, symbol: str, orderId: int = 0, limit: int = 500, **kwargs):
+        order_ids = sorted(i for i in self.orders if i >= orderId)[:limit]
+        return [self._order_response(self.orders[i]) for i in order_ids]
+
+    def get_order(self, symbol: str, orderId: int = None, origClientOrderId: str = None, **kwargs):
+        if orderId is None:
+            orderId = self.client_order_ids.get(origClientOrderId)
+        if orderId not in self.orders:
+            raise ClientError(400, self.ORDER_NOT_EXIST, "Order does not exist.", {})
+        return self._order_response(self.orders[orderId])
+
+    def match(self, tick: Tick):
+        """用一条行情撮合所有挂单"""
+        self.now, low, high, close = tick
+        self.last_price = close
+        if not self.open_orders:
+            return
+        through = self.fill_model == "through"
+        for order_id, order in list(self.open_orders.items()):
+            price = order["price"]
+            if order["side"] == "BUY":
+                filled = low < price if through else low <= price
+            else:
+                filled = high > price if through else high >= price
+            if not filled:
+                continue
+            order["status"] = "FILLED"
+            del self.open_orders[order_id]
+            notional = price * order["quantity"]
+            fee = notional * self.fee_rate
+            if order["side"] == "BUY":
+                self.quote -= notional + fee
+                self.base += order["quantity"]
+                self.entry_fills += 1
+            else:
+                self.quote += notional - fee
+                self.exit_fills += 1
+            self.version += 1
+
+
+def percentile(samples: array, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+# 回测期间替换为离线版本的arbitrage模块级对象
+OFFLINE_GLOBALS = (
+    "spot_client", "balance_buffer", "grid_store", "order_gateway",
+    "open_order_snapshot", "price_cache", "send_wx_notification",
+)
+
+
+def install_exchange(exchange: SimulatedExchange, symbol_config: dict,
+                     balance_buffer: int) -> Callable[[], None]:
+    """
+    将策略依赖的模块级对象替换为离线版本，之后创建的UsdcArbitrage通过exchange下单，
+    返回恢复原有对象的函数
+    """
+    saved = {name: getattr(arbitrage, name) for name in OFFLINE_GLOBALS}
+    saved_symbols = arbitrage.CONFIG["SYMBOLS"]
+    saved_level = arbitrage.logger.level
+
+    arbitrage.spot_client = exchange
+    arbitrage.balance_buffer = balance_buffer
+    arbitrage.CONFIG["SYMBOLS"] = {exchange.symbol: symbol_config}
+    arbitrage.grid_store = None
+    arbitrage.order_gateway = None
+    arbitrage.open_order_snapshot = arbitrage.OpenOrderSnapshot(max_age=0)
+    arbitrage.price_cache = arbitrage.PriceCache(max_age=0)
+    arbitrage.send_wx_notification = lambda title, message: None
+    arbitrage.logger.setLevel(logging.WARNING)
+
+    def restore():
+        for name, value in saved.items():
+            setattr(arbitrage, name, value)
+        arbitrage.CONFIG["SYMBOLS"] = saved_symbols
+        arbitrage.logger.setLevel(saved_level)
+
+    return restore
+
+
+def run_backtest(ticks: Iterable[Tick], symbol: str, symbol_config: dict, balance_buffer: int,
+                 quote_balance: Optional[float] = None, fee_rate: float = 0.0,
+                 fill_model: str = "through") -> dict:
+    """
+    用给定的参数回放行情，返回收益、成交次数、资金占用和每次策略计算的CPU耗时
+    """
+    exchange = SimulatedExchange(symbol, quote_balance=quote_balance, fee_rate=fee_rate, fill_model=fill_model)
+    restore = install_exchange(exchange, symbol_config, balance_buffer)
+    try:
+        return replay(ticks, exchange)
+    finally:
+        restore()
+
+
+def replay(ticks: Iterable[Tick], exchange: SimulatedExchange) -> dict:
+    """用UsdcArbitrage逐条回放行情，需要先调用install_exchange"""
+    grid = arbitrage.UsdcArbitrage(symbol=exchange.symbol)
+    cpu_ns = array("q")
+    capital_sum = 0.0
+    capital_max = 0.0
+    steps = 0
+    last_state = None
+
+    for tick in ticks:
+        exchange.match(tick)
+        # 行情与挂单都没有变化时策略的结果不会改变，直接跳过
+        state = (tick[1], tick[2], tick[3], exchange.version)
+        if state != last_state:
+            started = time.process_time_ns()
+            grid.check_and_update_orders()
+            cpu_ns.append(time.process_time_ns() - started)
+            last_state = (tick[1], tick[2], tick[3], exchange.version)
+        capital = exchange.capital_in_use()
+        capital_sum += capital
+        capital_max = max(capital_max, capital)
+        steps += 1
+
+    # 未平仓的持仓按最后价格计入收益
+    inventory = exchange.inventory()
+    return {
+        "symbol": exchange.symbol,
+        "ticks": steps,
+        "strategy_steps": len(cpu_ns),
+        "entry_fills": exchange.entry_fills,
+        "exit_fills": exchange.exit_fills,
+        "pnl": exchange.quote + inventory * exchange.last_price,
+        "inventory": inventory,
+        "max_capital": capital_max,
+        "avg_capital": capital_sum / steps if steps else 0.0,
+        "capital_utilization": (capital_sum / steps) / capital_max if capital_max else 0.0,
+        "cpu_us_mean": sum(cpu_ns) / len(cpu_ns) / 1000 if cpu_ns else 0.0,
+        "cpu_us_p50": percentile(cpu_ns, 0.5) / 1000,
+        "cpu_us_p99": percentile(cpu_ns, 0.99) / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格策略离线回测")
+    parser.add_argument("data", help="本地klines或aggTrades数据文件(.csv/.json)")
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--base-price", type=float)
+    parser.add_argument("--price-interval", type=float)
+    parser.add_argument("--profit-interval", type=float)
+    parser.add_argument("--max-orders", type=int)
+    parser.add_argument("--order-amount", type=float)
+    parser.add_argument("--balance-buffer", type=int, default=arbitrage.CONFIG["balance_buffer"])
+    parser.add_argument("--quote-balance", type=float, help="初始报价资产，不填表示资金不限")
+    parser.add_argument("--fee-rate", type=float, default=0.0)
+    parser.add_argument("--fill-model", choices=["through", "touch"], default="through")
+    args = parser.parse_args()
+
+    symbol_config = dict(arbitrage.CONFIG["SYMBOLS"].get(args.symbol, {}))
+    overrides = {
+        "BASE_PRICE": args.base_price,
+        "PRICE_INTERVAL": args.price_interval,
+        "PROFIT_INTERVAL": args.profit_interval,
+        "MAX_ORDERS": args.max_orders,
+        "ORDER_AMOUNT": args.order_amount,
+    }
+    symbol_config.update({k: v for k, v in overrides.items() if v is not None})
+
+    ticks = load_market_data(args.data)
+    result = run_backtest(
+        ticks, args.symbol, symbol_config, args.balance_buffer,
+        quote_balance=args.quote_balance, fee_rate=args.fee_rate, fill_model=args.fill_model,
+    )
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
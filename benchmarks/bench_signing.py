@@ -0,0 +1,211 @@
+"""Microbenchmarks for request building and signing
+
+Every benchmark runs offline; REST calls go to endpoints mocked with `responses`.
+
+    python -m benchmarks.bench_signing                  # run and compare with the stored baseline
+    python -m benchmarks.bench_signing --save           # run and store the results as the new baseline
+    python -m benchmarks.bench_signing -k sign --rounds 500
+
+Baselines are machine specific, regenerate them with --save on the machine used for comparison.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from time import perf_counter
+
+import responses
+from Crypto.PublicKey import ECC, RSA
+
+from binance.lib.authentication import (
+    create_signer,
+    ed25519_signature,
+    hmac_hashing,
+    rsa_signature,
+)
+from binance.lib.utils import cleanNoneValue, encoded_string, websocket_api_signature
+from binance.spot import Spot
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+API_KEY = "vmPUZE6mv9SD5VNHk4HlWFsOr6aKE2zvsw0MuIgwCIPy6utIco14y7Ju91duEh8A"
+API_SECRET = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+
+ORDER_PARAMS = {
+    "symbol": "FDUSDUSDT",
+    "side": "BUY",
+    "type": "LIMIT",
+    "timeInForce": "GTC",
+    "quantity": 10,
+    "price": "0.9984",
+    "newClientOrderId": None,
+    "stopPrice": None,
+    "icebergQty": None,
+    "newOrderRespType": None,
+    "recvWindow": 5000,
+}
+QUERY_STRING = encoded_string(
+    cleanNoneValue(dict(ORDER_PARAMS, timestamp=1700000000000))
+)
+
+
+def _keys():
+    rsa_key = RSA.generate(2048).export_key().decode("utf-8")
+    ed25519_key = ECC.generate(curve="ed25519").export_key(format="PEM")
+    return rsa_key, ed25519_key
+
+
+def build_benchmarks():
+    """Return {name: (callable, calls per sample)}"""
+
+    rsa_key, ed25519_key = _keys()
+    hmac_signer = create_signer(api_secret=API_SECRET)
+    rsa_signer = create_signer(private_key=rsa_key)
+    ed25519_signer = create_signer(private_key=ed25519_key)
+    client = Spot(API_KEY, API_SECRET, base_url="https://api.binance.com")
+
+    return {
+        "cleanNoneValue": (lambda: cleanNoneValue(ORDER_PARAMS), 100),
+        "encoded_string": (lambda: encoded_string(cleanNoneValue(ORDER_PARAMS)), 100),
+        "API._prepare_params": (lambda: client._prepare_params(ORDER_PARAMS), 100),
+        "hmac_hashing": (lambda: hmac_hashing(API_SECRET, QUERY_STRING), 100),
+        "HmacSigner.sign": (lambda: hmac_signer.sign(QUERY_STRING), 100),
+        "rsa_signature": (lambda: rsa_signature(rsa_key, QUERY_STRING), 1),
+        "RsaSigner.sign": (lambda: rsa_signer.sign(QUERY_STRING), 1),
+        "ed25519_signature": (lambda: ed25519_signature(ed25519_key, QUERY_STRING), 1),
+        "Ed25519Signer.sign": (lambda: ed25519_signer.sign(QUERY_STRING), 10),
+        "websocket_api_signature": (
+            lambda: websocket_api_signature(API_KEY, API_SECRET, dict(ORDER_PARAMS)),
+            100,
+        ),
+        "websocket_api_signature[signer]": (
+            lambda: websocket_api_signature(
+                API_KEY, API_SECRET, dict(ORDER_PARAMS), hmac_signer
+            ),
+            100,
+        ),
+        "API.sign_request[mocked]": (
+            lambda: client.sign_request("POST", "/api/v3/order", dict(ORDER_PARAMS)),
+            10,
+        ),
+        "Spot.new_order[mocked]": (
+            lambda: client.new_order(
+                "FDUSDUSDT",
+                "BUY",
+                "LIMIT",
+                quantity=10,
+                price="0.9984",
+                timeInForce="GTC",
+            ),
+            10,
+        ),
+        "API.query[mocked]": (
+            lambda: client.query("/api/v3/ticker/price", {"symbol": "FDUSDUSDT"}),
+            10,
+        ),
+    }
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def measure(fn, inner, rounds, warmup=10):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(rounds):
+        started = perf_counter()
+        for _ in range(inner):
+            fn()
+        samples.append((perf_counter() - started) / inner * 1e6)
+    return {
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 0.5),
+        "p90": percentile(samples, 0.9),
+        "p99": percentile(samples, 0.99),
+    }
+
+
+def run(names=None, rounds=200):
+    results = {}
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add(responses.POST, re.compile(".*/api/v3/order"), json={"orderId": 1})
+        mock.add(
+            responses.GET,
+            re.compile(".*/api/v3/ticker/price"),
+            json={"symbol": "FDUSDUSDT", "price": "0.9984"},
+        )
+        for name, (fn, inner) in build_benchmarks().items():
+            if names and not any(pattern in name for pattern in names):
+                continue
+            # the slow asymmetric signatures get fewer rounds
+            results[name] = measure(
+                fn, inner, rounds if inner > 1 else max(rounds // 10, 10)
+            )
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the results next to the baseline, return the names slower than the threshold"""
+
+    regressions = []
+    print(
+        f"{'benchmark':34} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'baseline p50':>13} {'change':>8}"
+    )
+    for name, stats in results.items():
+        line = (
+            f"{name:34} {stats['p50']:10.2f} {stats['p90']:10.2f} {stats['p99']:10.2f}"
+        )
+        if name in baseline:
+            change = stats["p50"] / baseline[name]["p50"] - 1
+            line += f" {baseline[name]['p50']:13.2f} {change:+8.1%}"
+            if change > threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="signing and request-building microbenchmarks"
+    )
+    parser.add_argument(
+        "-k", action="append", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="p50 slowdown reported as regression",
+    )
+    args = parser.parse_args()
+
+    results = run(args.k, args.rounds)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
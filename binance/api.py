@@ -2,13 +2,21 @@ import json
 from json import JSONDecodeError
 import logging
 import requests
+from time import perf_counter, time
+from requests.adapters import HTTPAdapter
 from .__version__ import __version__
 from binance.error import ClientError, ServerError
 from binance.lib.utils import get_timestamp
 from binance.lib.utils import cleanNoneValue
 from binance.lib.utils import encoded_string
 from binance.lib.utils import check_required_parameter
-from binance.lib.authentication import hmac_hashing, rsa_signature, ed25519_signature
+from binance.lib.http_adapter import TimedHTTPAdapter
+from binance.lib.authentication import create_signer
+
+try:
+    from orjson import loads as default_json_decoder
+except ImportError:
+    from json import loads as default_json_decoder
 
 
 class API(object):
@@ -23,6 +31,15 @@ class API(object):
         time_unit (str, optional): select a time unit. By default, it's None.
         private_key (str, optional): RSA private key for RSA authentication
         private_key_pass(str, optional): Password for PSA private key
+        rate_limiter (RateLimiter, optional): governor pacing /api/ requests by weight and order count, can be shared between clients. By default it's None
+        pool_connections (int, optional): number of host connection pools to cache. By default it's 10
+        pool_maxsize (int, optional): maximum number of keep-alive connections per host, set it to the number of threads sharing the client. By default it's 10
+        max_retries (int, optional): number of retries for connections that fail before the request is sent. By default it's 0
+        keep_alive (bool, optional): whether to reuse connections between requests. By default it's True
+        json_decoder (callable, optional): function decoding the response body bytes. By default it's orjson.loads when orjson is installed, otherwise json.loads
+        raw (bool, optional): whether to return the response body as bytes without decoding it. By default it's False
+        clock (ClockSync, optional): server time estimate used for the timestamp of signed requests, fed by the Date header of every response and resynced with GET /api/v3/time when stale. Can be shared with a SpotWebsocketAPIClient. By default it's None
+        timing_hook (callable, optional): called after every request with a dict of method, url_path, status_code, dns, connect, tls, ttfb, total and reused. By default it's None
     """
 
     def __init__(
@@ -37,6 +54,15 @@ class API(object):
         time_unit=None,
         private_key=None,
         private_key_pass=None,
+        rate_limiter=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=0,
+        keep_alive=True,
+        timing_hook=None,
+        json_decoder=None,
+        raw=False,
+        clock=None,
     ):
         self.api_key = api_key
         self.api_secret = api_secret
@@ -47,7 +73,21 @@ class API(object):
         self.show_header = False
         self.private_key = private_key
         self.private_key_pass = private_key_pass
+        self._signer = None
+        self.rate_limiter = rate_limiter
+        self.timing_hook = timing_hook
+        self.json_decoder = json_decoder or default_json_decoder
+        self.raw = raw is True
+        self.clock = clock
         self.session = requests.Session()
+        adapter_class = HTTPAdapter if timing_hook is None else TimedHTTPAdapter
+        adapter = adapter_class(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "Content-Type": "application/json;charset=utf-8",
@@ -64,6 +104,9 @@ class API(object):
         ):
             self.session.headers.update({"X-MBX-TIME-UNIT": time_unit})
 
+        if keep_alive is False:
+            self.session.headers.update({"Connection": "close"})
+
         if show_limit_usage is True:
             self.show_limit_usage = True
 
@@ -86,12 +129,9 @@ class API(object):
         return self.send_request(http_method, url_path, payload=payload)
 
     def sign_request(self, http_method, url_path, payload=None):
-        if payload is None:
-            payload = {}
-        payload["timestamp"] = get_timestamp()
-        query_string = self._prepare_params(payload)
-        payload["signature"] = self._get_sign(query_string)
-        return self.send_request(http_method, url_path, payload)
+        return self.send_request(
+            http_method, url_path, payload, sign=self._sign_payload
+        )
 
     def limited_encoded_sign_request(self, http_method, url_path, payload=None):
         """This is used for some endpoints has special symbol in the url.
@@ -102,19 +142,32 @@ class API(object):
 
         so we have to append those parameters in the url
         """
-        if payload is None:
-            payload = {}
-        payload["timestamp"] = get_timestamp()
+        return self.send_request(http_method, url_path, payload, sign=self._sign_url)
+
+    def _sign_payload(self, url_path, payload):
+        payload["timestamp"] = self._get_timestamp()
+        query_string = self._prepare_params(payload)
+        payload["signature"] = self._get_sign(query_string)
+        return url_path, payload
+
+    def _sign_url(self, url_path, payload):
+        payload["timestamp"] = self._get_timestamp()
         query_string = self._prepare_params(payload)
         url_path = (
             url_path + "?" + query_string + "&signature=" + self._get_sign(query_string)
         )
-        return self.send_request(http_method, url_path)
+        return url_path, {}
 
-    def send_request(self, http_method, url_path, payload=None):
+    def send_request(self, http_method, url_path, payload=None, sign=None):
         if payload is None:
             payload = {}
-        url = self.base_url + url_path
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(http_method, url_path, payload)
+        # signed once the limiter lets the request through, a wait must not eat into recvWindow
+        request_path = url_path
+        if sign is not None:
+            request_path, payload = sign(url_path, payload)
+        url = self.base_url + request_path
         self._logger.debug("url: " + url)
         params = cleanNoneValue(
             {
@@ -124,30 +177,81 @@ class API(object):
                 "proxies": self.proxies,
             }
         )
+        sent = time()
+        started = perf_counter()
         response = self._dispatch_request(http_method)(**params)
-        self._logger.debug("raw response from server:" + response.text)
-        self._handle_exception(response)
+        self._check_response(
+            http_method,
+            url_path,
+            response.status_code,
+            response.headers,
+            lambda: response.text,
+            (sent, started, getattr(response, "timings", {})),
+        )
+        return self._build_result(
+            self._decode(response.content, lambda: response.text), response.headers
+        )
+
+    def _check_response(
+        self, http_method, url_path, status_code, headers, get_text, timing
+    ):
+        """Steps shared by the transports once a response is received, raises on error statuses
+
+        timing is (local time sent, perf_counter at start, transport timings)
+        """
 
+        sent, started, timings = timing
+        if self.clock is not None:
+            self.clock.observe_date(headers.get("Date"), sent, time())
+        if self.timing_hook is not None:
+            self.timing_hook(
+                {
+                    "method": http_method,
+                    "url_path": url_path,
+                    "status_code": status_code,
+                    **timings,
+                    "total": perf_counter() - started,
+                }
+            )
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(url_path, status_code, headers)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("raw response from server:" + get_text())
+        if status_code < 400:
+            return
         try:
-            data = response.json()
+            self._handle_exception(status_code, get_text(), headers)
+        except ClientError as error:
+            # timestamp outside of recvWindow, the clock estimate is wrong
+            if self.clock is not None and error.error_code == -1021:
+                self.clock.invalidate()
+            raise
+
+    def _decode(self, content, get_text):
+        if self.raw:
+            return content
+        try:
+            return self.json_decoder(content)
         except ValueError:
-            data = response.text
+            return get_text()
+
+    def _build_result(self, data, headers):
         result = {}
 
         if self.show_limit_usage:
             limit_usage = {}
-            for key in response.headers.keys():
+            for key in headers.keys():
                 key = key.lower()
                 if (
                     key.startswith("x-mbx-used-weight")
                     or key.startswith("x-mbx-order-count")
                     or key.startswith("x-sapi-used")
                 ):
-                    limit_usage[key] = response.headers[key]
+                    limit_usage[key] = headers[key]
             result["limit_usage"] = limit_usage
 
         if self.show_header:
-            result["header"] = response.headers
+            result["header"] = headers
 
         if len(result) != 0:
             result["data"] = data
@@ -155,19 +259,23 @@ class API(object):
 
         return data
 
+    def _get_timestamp(self):
+        if self.clock is None:
+            return get_timestamp()
+        if self.clock.needs_sync():
+            self.clock.sync(self)
+        return self.clock.timestamp()
+
     def _prepare_params(self, params):
         return encoded_string(cleanNoneValue(params))
 
     def _get_sign(self, payload):
-        if self.private_key is not None:
-            try:
-                return ed25519_signature(
-                    self.private_key, payload, self.private_key_pass
-                )
-            except ValueError:
-                return rsa_signature(self.private_key, payload, self.private_key_pass)
-        else:
-            return hmac_hashing(self.api_secret, payload)
+        # the key is parsed once, on the first signed request
+        if self._signer is None:
+            self._signer = create_signer(
+                self.api_secret, self.private_key, self.private_key_pass
+            )
+        return self._signer.sign(payload)
 
     def _dispatch_request(self, http_method):
         return {
@@ -177,21 +285,16 @@ class API(object):
             "POST": self.session.post,
         }.get(http_method, "GET")
 
-    def _handle_exception(self, response):
-        status_code = response.status_code
+    def _handle_exception(self, status_code, text, headers):
         if status_code < 400:
             return
         if 400 <= status_code < 500:
             try:
-                err = json.loads(response.text)
+                err = json.loads(text)
             except JSONDecodeError:
-                raise ClientError(
-                    status_code, None, response.text, response.headers, None
-                )
+                raise ClientError(status_code, None, text, headers, None)
             error_data = None
             if "data" in err:
                 error_data = err["data"]
-            raise ClientError(
-                status_code, err["code"], err["msg"], response.headers, error_data
-            )
-        raise ServerError(status_code, response.text)
+            raise ClientError(status_code, err["code"], err["msg"], headers, error_data)
+        raise ServerError(status_code, text)
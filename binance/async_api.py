@@ -0,0 +1,170 @@
+import asyncio
+import json
+from time import perf_counter, time
+from binance.api import API
+from binance.lib.utils import cleanNoneValue
+
+
+class AsyncAPI(API):
+    """Asyncio counterpart of API, sharing its signing, limit usage and error handling
+
+    Requests go through one pooled aiohttp keep-alive session that is created on first use
+    and must be closed with ``await client.close()`` or by using the client as an async
+    context manager. Every request method returns a coroutine.
+    Requires the aiohttp package.
+
+    Keyword Args:
+        pool_maxsize (int, optional): maximum number of concurrent connections. By default it's 100
+        keep_alive (bool, optional): whether to reuse connections between requests. By default it's True
+        The other keyword arguments are the same as API. A shared rate_limiter is acquired in a worker
+        thread so the event loop is never blocked. timing_hook receives dns, connect (including TLS),
+        ttfb, total and reused; tls is always None.
+    """
+
+    def __init__(
+        self, api_key=None, api_secret=None, pool_maxsize=100, keep_alive=True, **kwargs
+    ):
+        super().__init__(api_key, api_secret, keep_alive=keep_alive, **kwargs)
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.headers = {
+            key: value
+            for key, value in self.session.headers.items()
+            if key.startswith("X-MBX-")
+            or key in ("Content-Type", "User-Agent", "Connection")
+        }
+        self.headers = cleanNoneValue(self.headers)
+        if keep_alive is not False:
+            self.headers.pop("Connection", None)
+        self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            import aiohttp
+
+            trace_configs = []
+            if self.timing_hook is not None:
+                trace_configs.append(_timing_trace_config(aiohttp))
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_maxsize, force_close=not self.keep_alive
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=trace_configs,
+            )
+        return self.session
+
+    def _get_timestamp(self):
+        # signing is synchronous here, the clock is resynced by sync_clock()
+        if self.clock is None:
+            return super()._get_timestamp()
+        return self.clock.timestamp()
+
+    async def sync_clock(self):
+        """Take a time() sample for the clock, call it periodically, e.g. every clock.resync_interval"""
+
+        sent = time()
+        response = await self.send_request("GET", "/api/v3/time")
+        received = time()
+        if isinstance(response, bytes):
+            response = json.loads(response)
+        self.clock.add_sample(
+            response.get("data", response)["serverTime"], sent, received
+        )
+
+    async def send_request(self, http_method, url_path, payload=None, sign=None):
+        from yarl import URL
+
+        if payload is None:
+            payload = {}
+        session = self._get_session()
+        if self.rate_limiter is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.rate_limiter.acquire, http_method, url_path, payload
+            )
+        # signed once the limiter lets the request through, a wait must not eat into recvWindow
+        request_path = url_path
+        if sign is not None:
+            request_path, payload = sign(url_path, payload)
+        url = self.base_url + request_path
+        self._logger.debug("url: " + url)
+        query_string = self._prepare_params(payload)
+        if query_string:
+            url = url + ("&" if "?" in url else "?") + query_string
+        proxy = None
+        if self.proxies is not None:
+            proxy = self.proxies.get(url.split(":", 1)[0])
+
+        timings = {"dns": None, "connect": None, "tls": None}
+        sent = time()
+        started = perf_counter()
+        async with session.request(
+            http_method, URL(url, encoded=True), proxy=proxy, trace_request_ctx=timings
+        ) as response:
+            content = await response.read()
+            status_code = response.status
+            headers = response.headers
+        timings["reused"] = timings["connect"] is None
+        self._check_response(
+            http_method,
+            url_path,
+            status_code,
+            headers,
+            lambda: _text(content),
+            (sent, started, timings),
+        )
+        return self._build_result(
+            self._decode(content, lambda: _text(content)), headers
+        )
+
+
+def _text(content):
+    return content.decode("utf-8", "replace")
+
+
+def _timing_trace_config(aiohttp):
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.trace_request_ctx["started"] = perf_counter()
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.trace_request_ctx["dns_started"] = perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        timings = context.trace_request_ctx
+        timings["dns"] = perf_counter() - timings.pop("dns_started")
+
+    async def on_connection_create_start(session, context, params):
+        context.trace_request_ctx["connect_started"] = perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        timings = context.trace_request_ctx
+        timings["connect"] = (
+            perf_counter() - timings.pop("connect_started") - (timings["dns"] or 0)
+        )
+
+    async def on_request_end(session, context, params):
+        timings = context.trace_request_ctx
+        timings["ttfb"] = perf_counter() - timings.pop("started")
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
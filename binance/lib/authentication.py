@@ -23,3 +23,50 @@ def ed25519_signature(private_key, payload, private_key_pass=None):
     signer = eddsa.new(private_key, "rfc8032")
     signature = signer.sign(payload.encode("utf-8"))
     return b64encode(signature)
+
+
+class HmacSigner(object):
+    """HMAC SHA256 signer keyed once, each message is signed on a copy of the keyed state"""
+
+    def __init__(self, api_secret):
+        self._hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def sign(self, payload):
+        m = self._hmac.copy()
+        m.update(payload.encode("utf-8"))
+        return m.hexdigest()
+
+
+class RsaSigner(object):
+    """RSA signer holding the private key imported once"""
+
+    def __init__(self, private_key, private_key_pass=None):
+        self._signer = pkcs1_15.new(
+            RSA.import_key(private_key, passphrase=private_key_pass)
+        )
+
+    def sign(self, payload):
+        return b64encode(self._signer.sign(SHA256.new(payload.encode("utf-8"))))
+
+
+class Ed25519Signer(object):
+    """Ed25519 signer holding the private key imported once"""
+
+    def __init__(self, private_key, private_key_pass=None):
+        self._signer = eddsa.new(
+            ECC.import_key(private_key, passphrase=private_key_pass), "rfc8032"
+        )
+
+    def sign(self, payload):
+        return b64encode(self._signer.sign(payload.encode("utf-8")))
+
+
+def create_signer(api_secret=None, private_key=None, private_key_pass=None):
+    """Build the signer for the given credentials, a private key takes precedence over the api secret"""
+
+    if private_key is not None:
+        try:
+            return Ed25519Signer(private_key, private_key_pass)
+        except ValueError:
+            return RsaSigner(private_key, private_key_pass)
+    return HmacSigner(api_secret)
@@ -0,0 +1,133 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+class ClockSync(object):
+    """Estimate of the offset between the local clock and Binance server time
+
+    Offset samples come from two sources:
+    - time() calls, sync() times a GET /api/v3/time, the offset is taken at the midpoint of the round trip.
+    - Date headers of ordinary responses, free but only precise to the second.
+
+    As in the NTP clock filter, every sample carries an error bound of half its round trip
+    (plus half a second for Date headers) growing with its age, and the estimate is the sample
+    with the lowest current bound among the last window time() samples.
+    A Date header disagreeing with the estimate by more than both bounds means the local clock
+    stepped, the stored samples are dropped and the next signed request resyncs.
+    One instance can be shared by REST and WebSocket API clients.
+
+    Keyword Args:
+        window (int, optional): number of time() samples kept. By default it's 8
+        resync_interval (int, optional): seconds after which a new time() sample is taken. By default it's 600
+    """
+
+    DATE_PRECISION = 500  # Date headers are truncated to the second
+    DRIFT_RATE = 15e-6  # assumed worst case local clock drift, in seconds per second
+
+    def __init__(self, window=8, resync_interval=600):
+        self.resync_interval = resync_interval
+        self.samples = deque(maxlen=window)  # (offset ms, error ms, taken at)
+        self.date_sample = None
+        self.synced_at = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def _current_error(self, sample, now):
+        return sample[1] + (now - sample[2]) * self.DRIFT_RATE * 1000
+
+    def _best(self, now):
+        if self.samples:
+            return min(
+                self.samples, key=lambda sample: self._current_error(sample, now)
+            )
+        return self.date_sample
+
+    @property
+    def offset(self):
+        """Server time minus local time in milliseconds"""
+
+        with self._lock:
+            best = self._best(time.time())
+        return best[0] if best else 0
+
+    @property
+    def error(self):
+        """Error bound of the offset in milliseconds, None before the first sample"""
+
+        now = time.time()
+        with self._lock:
+            best = self._best(now)
+        return self._current_error(best, now) if best else None
+
+    def timestamp(self):
+        """Current server time in milliseconds"""
+
+        return int(time.time() * 1000 + self.offset)
+
+    def needs_sync(self):
+        return time.time() - self.synced_at >= self.resync_interval
+
+    def invalidate(self):
+        """Drop the time() samples and resync on the next signed request, e.g. after a -1021 error"""
+
+        with self._lock:
+            self.samples.clear()
+            self.synced_at = 0
+
+    def add_sample(self, server_time, sent, received):
+        """Add a server time in milliseconds received for a request sent and answered at the given local times"""
+
+        offset = server_time - (sent + received) * 500
+        with self._lock:
+            self.samples.append((offset, (received - sent) * 500, received))
+            self.synced_at = received
+
+    def observe_date(self, date, sent, received):
+        """Check the estimate against a Date response header"""
+
+        if not date:
+            return
+        try:
+            server_time = parsedate_to_datetime(date).timestamp() * 1000
+        except (TypeError, ValueError):
+            return
+        offset = server_time + self.DATE_PRECISION - (sent + received) * 500
+        error = (received - sent) * 500 + self.DATE_PRECISION
+        with self._lock:
+            self.date_sample = (offset, error, received)
+            best = self._best(received) if self.samples else None
+            if best is None:
+                return
+            if abs(offset - best[0]) > error + self._current_error(best, received):
+                self._logger.warning(
+                    "local clock moved %.0fms against server time, resyncing",
+                    offset - best[0],
+                )
+                self.samples.clear()
+                self.synced_at = 0
+
+    def sync(self, client):
+        """Take a time() sample through a Spot client, failures are logged and retried after resync_interval"""
+
+        # another thread is already syncing, its sample will be used
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            sent = time.time()
+            response = client.query("/api/v3/time")
+            received = time.time()
+            if isinstance(response, bytes):
+                response = json.loads(response)
+            self.add_sample(
+                response.get("data", response)["serverTime"], sent, received
+            )
+        except Exception as e:
+            self._logger.warning("clock sync failed: %s", e)
+            self.synced_at = time.time()
+        finally:
+            self._sync_lock.release()
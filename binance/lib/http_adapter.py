@@ -0,0 +1,110 @@
+import socket
+import threading
+from time import perf_counter
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+_local = threading.local()
+
+
+def _current_timings():
+    return getattr(_local, "timings", None)
+
+
+class _TimedConnectionMixin(object):
+    def _new_conn(self):
+        timings = _current_timings()
+        if timings is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        started = perf_counter()
+        try:
+            addresses = [
+                info[4][0]
+                for info in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+            ]
+        except OSError:
+            # let urllib3 raise its own resolution error
+            addresses = [host]
+        resolved = perf_counter()
+        timings["dns"] = resolved - started
+
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+        timings["connect"] = perf_counter() - resolved
+        return sock
+
+    def connect(self):
+        started = perf_counter()
+        super().connect()
+        timings = _current_timings()
+        if timings is not None and timings["connect"] is not None:
+            handshake = perf_counter() - started - timings["dns"] - timings["connect"]
+            timings["tls"] = handshake if isinstance(self, HTTPSConnection) else 0.0
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+POOL_CLASSES = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter recording the phases of every request on ``response.timings``
+
+    - dns: name resolution, None when a pooled connection was reused
+    - connect: TCP connect, None when a pooled connection was reused
+    - tls: TLS handshake, None when a pooled connection was reused
+    - ttfb: from sending the request until the response headers arrived, including any connection setup
+    - reused: whether the request went over an existing keep-alive connection
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = POOL_CLASSES
+        return manager
+
+    def send(self, request, **kwargs):
+        timings = {"dns": None, "connect": None, "tls": None}
+        _local.timings = timings
+        started = perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            _local.timings = None
+        timings["ttfb"] = perf_counter() - started
+        timings["reused"] = timings["connect"] is None
+        response.timings = timings
+        return response
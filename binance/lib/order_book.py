@@ -0,0 +1,198 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+
+class PriceLadder(object):
+    """Price levels of one side of a book, best price first
+
+    Prices are kept in a sorted list searched with bisect and quantities in a dict,
+    so updating a level is a dict write plus, for new or emptied levels, one list insert or delete.
+
+    Keyword Args:
+        descending (bool, optional): whether the best price is the highest, i.e. the bid side. By default it's False
+    """
+
+    def __init__(self, descending=False):
+        self.sign = -1 if descending else 1
+        self._keys = []  # sign * price, ascending
+        self._quantities = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def set(self, price, quantity):
+        """Set the quantity of a level, a zero quantity removes it"""
+
+        key = self.sign * float(price)
+        quantity = float(quantity)
+        if quantity == 0:
+            if self._quantities.pop(key, None) is not None:
+                del self._keys[bisect_left(self._keys, key)]
+            return
+        if key not in self._quantities:
+            insort(self._keys, key)
+        self._quantities[key] = quantity
+
+    def replace(self, levels):
+        """Replace all levels with [price, quantity] pairs, e.g. from a depth snapshot"""
+
+        self._quantities = {
+            self.sign * float(price): float(quantity)
+            for price, quantity in levels
+            if float(quantity) != 0
+        }
+        self._keys = sorted(self._quantities)
+
+    def best(self):
+        """(price, quantity) of the best level, None if the side is empty"""
+
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return self.sign * key, self._quantities[key]
+
+    def levels(self, count=None):
+        """(price, quantity) of the best count levels, all levels by default"""
+
+        keys = self._keys if count is None else self._keys[:count]
+        return [(self.sign * key, self._quantities[key]) for key in keys]
+
+    def quantity(self, price):
+        """Quantity resting at a price, 0 if there is no level"""
+
+        return self._quantities.get(self.sign * float(price), 0.0)
+
+    def quantity_ahead(self, price):
+        """Total quantity at the price and better prices, i.e. queued ahead of a new order at that price"""
+
+        end = bisect_right(self._keys, self.sign * float(price))
+        return sum(self._quantities[key] for key in self._keys[:end])
+
+
+class LocalOrderBook(object):
+    """Order book of one symbol maintained from a diff depth stream and a REST depth snapshot
+
+    Feed every message of the symbol's <symbol>@depth or <symbol>@depth@100ms stream to on_message,
+    raw or combined. Following the Binance procedure, events are buffered until a snapshot is fetched
+    with client.depth(), events already contained in the snapshot are dropped and the rest are applied
+    in order. An event whose first update id U does not follow the last applied id means updates were
+    missed, e.g. across a reconnect; the book is then discarded and rebuilt from a new snapshot.
+    Snapshots are fetched in the thread calling on_message, at most once per resync_delay seconds.
+
+    Args:
+        client (Spot): REST client used for the snapshots
+        symbol (str): the trading pair
+    Keyword Args:
+        limit (int, optional): number of levels of the snapshot. By default it's 1000
+        resync_delay (float, optional): minimum seconds between two snapshots. By default it's 1
+    """
+
+    def __init__(self, client, symbol, limit=1000, resync_delay=1):
+        self.client = client
+        self.symbol = symbol.upper()
+        self.limit = limit
+        self.resync_delay = resync_delay
+        self.bids = PriceLadder(descending=True)
+        self.asks = PriceLadder()
+        self.last_update_id = None
+        self._buffer = []
+        self._next_snapshot = 0
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def synced(self):
+        return self.last_update_id is not None
+
+    def on_message(self, _, message):
+        """Callback for the stream client, accepts raw and combined stream messages"""
+
+        event = json.loads(message) if isinstance(message, (str, bytes)) else message
+        self.update(event.get("data", event))
+
+    def update(self, event):
+        """Apply a depthUpdate event, other events and symbols are ignored"""
+
+        if event.get("e") != "depthUpdate" or event.get("s") != self.symbol:
+            return
+        if self.last_update_id is None:
+            self._buffer.append(event)
+            if time.time() >= self._next_snapshot:
+                self._load_snapshot()
+            return
+        if event["u"] <= self.last_update_id:
+            return
+        if event["U"] > self.last_update_id + 1:
+            self._logger.warning(
+                "%s depth updates %s to %s missed, resyncing",
+                self.symbol,
+                self.last_update_id + 1,
+                event["U"] - 1,
+            )
+            self.reset()
+            self.update(event)
+            return
+        with self._lock:
+            self._apply(event)
+
+    def reset(self):
+        """Discard the book, it is rebuilt from a new snapshot on the next event"""
+
+        with self._lock:
+            self.last_update_id = None
+            self.bids.replace([])
+            self.asks.replace([])
+        self._buffer = []
+
+    def _load_snapshot(self):
+        self._next_snapshot = time.time() + self.resync_delay
+        try:
+            snapshot = self.client.depth(self.symbol, limit=self.limit)
+        except Exception as e:
+            self._logger.warning("%s depth snapshot failed: %s", self.symbol, e)
+            return
+        if isinstance(snapshot, bytes):
+            snapshot = json.loads(snapshot)
+        snapshot = snapshot.get("data", snapshot)
+        last_update_id = snapshot["lastUpdateId"]
+
+        events = [event for event in self._buffer if event["u"] > last_update_id]
+        if events and events[0]["U"] > last_update_id + 1:
+            # the snapshot is older than the buffered events, wait for a newer one
+            self._buffer = events
+            return
+        self._buffer = []
+        with self._lock:
+            self.bids.replace(snapshot["bids"])
+            self.asks.replace(snapshot["asks"])
+            self.last_update_id = last_update_id
+            for index, event in enumerate(events):
+                if event["U"] > self.last_update_id + 1:
+                    self.last_update_id = None
+                    self._buffer = events[index:]
+                    return
+                self._apply(event)
+
+    def _apply(self, event):
+        for price, quantity in event["b"]:
+            self.bids.set(price, quantity)
+        for price, quantity in event["a"]:
+            self.asks.set(price, quantity)
+        self.last_update_id = event["u"]
+
+    def best_bid(self):
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self):
+        with self._lock:
+            return self.asks.best()
+
+    def depth(self, count=None):
+        """Consistent (bids, asks) copy of the best count levels of each side"""
+
+        with self._lock:
+            return self.bids.levels(count), self.asks.levels(count)
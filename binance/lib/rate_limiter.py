@@ -0,0 +1,216 @@
+import json
+import threading
+import time
+
+
+def _symbol_count(payload):
+    symbols = payload.get("symbols")
+    if symbols is None:
+        return 1 if payload.get("symbol") else 0
+    if isinstance(symbols, str):
+        try:
+            symbols = json.loads(symbols)
+        except ValueError:
+            return symbols.count(",") + 1
+    return len(symbols)
+
+
+def _depth_weight(payload):
+    limit = int(payload.get("limit") or 100)
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+def _ticker_24hr_weight(payload):
+    count = _symbol_count(payload)
+    if count == 0 or count > 100:
+        return 80
+    if count > 20:
+        return 40
+    return 2
+
+
+def _ticker_weight(payload):
+    return 2 if _symbol_count(payload) == 1 else 4
+
+
+def _per_symbol_weight(payload):
+    return min(max(_symbol_count(payload), 1) * 4, 200)
+
+
+def _open_orders_weight(payload):
+    return 6 if payload.get("symbol") else 80
+
+
+def _order_test_weight(payload):
+    return 20 if payload.get("computeCommissionRates") else 1
+
+
+ENDPOINT_WEIGHTS = {
+    ("GET", "/api/v3/ping"): 1,
+    ("GET", "/api/v3/time"): 1,
+    ("GET", "/api/v3/exchangeInfo"): 20,
+    ("GET", "/api/v3/depth"): _depth_weight,
+    ("GET", "/api/v3/trades"): 25,
+    ("GET", "/api/v3/historicalTrades"): 25,
+    ("GET", "/api/v3/aggTrades"): 2,
+    ("GET", "/api/v3/klines"): 2,
+    ("GET", "/api/v3/uiKlines"): 2,
+    ("GET", "/api/v3/avgPrice"): 2,
+    ("GET", "/api/v3/ticker/24hr"): _ticker_24hr_weight,
+    ("GET", "/api/v3/ticker/tradingDay"): _per_symbol_weight,
+    ("GET", "/api/v3/ticker/price"): _ticker_weight,
+    ("GET", "/api/v3/ticker/bookTicker"): _ticker_weight,
+    ("GET", "/api/v3/ticker"): _per_symbol_weight,
+    ("POST", "/api/v3/order/test"): _order_test_weight,
+    ("GET", "/api/v3/order"): 4,
+    ("GET", "/api/v3/openOrders"): _open_orders_weight,
+    ("GET", "/api/v3/allOrders"): 20,
+    ("GET", "/api/v3/orderList"): 4,
+    ("GET", "/api/v3/allOrderList"): 20,
+    ("GET", "/api/v3/openOrderList"): 6,
+    ("GET", "/api/v3/account"): 20,
+    ("GET", "/api/v3/myTrades"): 20,
+    ("GET", "/api/v3/rateLimit/order"): 40,
+    ("GET", "/api/v3/myPreventedMatches"): 4,
+    ("GET", "/api/v3/myAllocations"): 20,
+    ("GET", "/api/v3/account/commission"): 20,
+}
+
+# endpoints that place or cancel orders, served ahead of informational queries
+ORDER_ENDPOINTS = {
+    ("POST", "/api/v3/order"),
+    ("DELETE", "/api/v3/order"),
+    ("POST", "/api/v3/order/cancelReplace"),
+    ("DELETE", "/api/v3/openOrders"),
+    ("POST", "/api/v3/order/oco"),
+    ("POST", "/api/v3/orderList/oco"),
+    ("POST", "/api/v3/orderList/oto"),
+    ("POST", "/api/v3/orderList/otoco"),
+    ("DELETE", "/api/v3/orderList"),
+    ("POST", "/api/v3/sor/order"),
+}
+
+
+class RateLimiter(object):
+    """Thread-safe token bucket shared by every API instance it is passed to
+
+    The request weight bucket refills at weight_limit per minute and the order bucket at
+    order_limit per 10 seconds. Both are pulled down to the usage the server reports in
+    the X-MBX-USED-WEIGHT-1M and X-MBX-ORDER-COUNT-10S headers, and all requests wait
+    out the Retry-After period after a 429 or 418 response.
+    Only /api/ endpoints are governed, /sapi/ endpoints have their own limits.
+
+    Keyword Args:
+        weight_limit (int, optional): request weight allowed per minute. By default it's 6000
+        order_limit (int, optional): orders allowed per 10 seconds. By default it's 100
+        headroom (float, optional): share of each limit the governor may use. By default it's 0.95
+        order_reserve (float, optional): share of the weight bucket only order requests may use. By default it's 0.1
+    """
+
+    def __init__(
+        self, weight_limit=6000, order_limit=100, headroom=0.95, order_reserve=0.1
+    ):
+        self.weight_capacity = weight_limit * headroom
+        self.weight_rate = weight_limit / 60
+        self.order_capacity = order_limit * headroom
+        self.order_rate = order_limit / 10
+        self.order_reserve = self.weight_capacity * order_reserve
+        self.weight_tokens = self.weight_capacity
+        self.order_tokens = self.order_capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0
+        self.pending_orders = 0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def endpoint_weight(http_method, url_path, payload=None):
+        weight = ENDPOINT_WEIGHTS.get((http_method, url_path.split("?")[0]), 1)
+        if callable(weight):
+            return weight(payload or {})
+        return weight
+
+    @staticmethod
+    def is_order_request(http_method, url_path):
+        return (http_method, url_path.split("?")[0]) in ORDER_ENDPOINTS
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.weight_tokens = min(
+            self.weight_capacity, self.weight_tokens + elapsed * self.weight_rate
+        )
+        self.order_tokens = min(
+            self.order_capacity, self.order_tokens + elapsed * self.order_rate
+        )
+
+    def _wait_time(self, weight, is_order, counts_order, now):
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if not is_order and self.pending_orders:
+            return None
+        floor = 0 if is_order else self.order_reserve
+        # a request heavier than the whole bucket goes through once the bucket is full
+        needed = min(weight + floor, self.weight_capacity)
+        wait = max(needed - self.weight_tokens, 0) / self.weight_rate
+        if counts_order:
+            needed = min(1, self.order_capacity)
+            wait = max(wait, max(needed - self.order_tokens, 0) / self.order_rate)
+        return wait
+
+    def acquire(self, http_method, url_path, payload=None):
+        """Block until the request fits in the budget, then take its weight"""
+
+        if not url_path.startswith("/api/"):
+            return
+        weight = self.endpoint_weight(http_method, url_path, payload)
+        is_order = self.is_order_request(http_method, url_path)
+        counts_order = is_order and http_method == "POST"
+        with self._condition:
+            if is_order:
+                self.pending_orders += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait_time(weight, is_order, counts_order, now)
+                    if wait == 0:
+                        self.weight_tokens -= weight
+                        if counts_order:
+                            self.order_tokens -= 1
+                        return
+                    self._condition.wait(wait)
+            finally:
+                if is_order:
+                    self.pending_orders -= 1
+                    self._condition.notify_all()
+
+    def update(self, url_path, status_code, headers):
+        """Sync the buckets with the usage and back-off reported in the response headers"""
+
+        if not url_path.startswith("/api/"):
+            return
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            used_weight = headers.get("x-mbx-used-weight-1m")
+            if used_weight is not None:
+                self.weight_tokens = min(
+                    self.weight_tokens, self.weight_capacity - int(used_weight)
+                )
+            order_count = headers.get("x-mbx-order-count-10s")
+            if order_count is not None:
+                self.order_tokens = min(
+                    self.order_tokens, self.order_capacity - int(order_count)
+                )
+            if status_code in (418, 429):
+                retry_after = headers.get("Retry-After")
+                retry_after = int(retry_after) if retry_after else 1
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                self.weight_tokens = min(self.weight_tokens, 0)
+            self._condition.notify_all()
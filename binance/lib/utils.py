@@ -94,12 +94,16 @@ def purge_map(map: map):
     return {k: v for k, v in map.items() if v is not None and v != "" and v != 0}
 
 
-def websocket_api_signature(api_key: str, api_secret: str, parameters: dict):
+def websocket_api_signature(
+    api_key: str, api_secret: str, parameters: dict, signer=None, clock=None
+):
     """Generate signature for websocket API
     Args:
         api_key (str): API key.
         api_secret (str): API secret.
         params (dict): Parameters.
+        signer (HmacSigner, optional): signer keyed with api_secret, reused instead of keying a new HMAC.
+        clock (ClockSync, optional): server time estimate used for the timestamp.
     """
 
     if not api_key or not api_secret:
@@ -107,11 +111,14 @@ def websocket_api_signature(api_key: str, api_secret: str, parameters: dict):
             "api_key and api_secret are required for websocket API signature"
         )
 
-    parameters["timestamp"] = get_timestamp()
+    parameters["timestamp"] = get_timestamp() if clock is None else clock.timestamp()
     parameters["apiKey"] = api_key
 
     parameters = OrderedDict(sorted(parameters.items()))
-    parameters["signature"] = hmac_hashing(api_secret, urlencode(parameters))
+    if signer is None:
+        parameters["signature"] = hmac_hashing(api_secret, urlencode(parameters))
+    else:
+        parameters["signature"] = signer.sign(urlencode(parameters))
 
     return parameters
 
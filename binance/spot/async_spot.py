@@ -0,0 +1,22 @@
+from binance.async_api import AsyncAPI
+from binance.spot import Spot
+
+
+class AsyncSpot(AsyncAPI):
+    """Spot client on the asyncio transport, every endpoint method of Spot returns a coroutine
+
+    e.g.
+        async with AsyncSpot(api_key, api_secret) as client:
+            prices = await asyncio.gather(*(client.ticker_price(s) for s in symbols))
+    """
+
+    def __init__(self, api_key=None, api_secret=None, **kwargs):
+        if "base_url" not in kwargs:
+            kwargs["base_url"] = "https://api.binance.com"
+        super().__init__(api_key, api_secret, **kwargs)
+
+
+# reuse the endpoint functions of Spot, they return whatever send_request returns
+for _name, _endpoint in vars(Spot).items():
+    if not _name.startswith("_") and callable(_endpoint):
+        setattr(AsyncSpot, _name, _endpoint)
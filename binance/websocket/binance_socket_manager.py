@@ -1,7 +1,10 @@
 from typing import Optional
 
+import json
 import logging
+import random
 import threading
+import time
 from websocket import (
     ABNF,
     create_connection,
@@ -9,10 +12,40 @@ from websocket import (
     WebSocketConnectionClosedException,
     WebSocketTimeoutException,
 )
-from binance.lib.utils import parse_proxies
+from binance.api import default_json_decoder
+from binance.lib.utils import get_timestamp, parse_proxies
 
 
 class BinanceSocketManager(threading.Thread):
+    """Thread reading one WebSocket connection and dispatching its frames to the callbacks
+
+    With reconnect, a lost connection is reopened after a jittered exponential backoff and the
+    streams subscribed through the client are subscribed again; on_open is called for the first
+    connection and after every reconnect, on_close once, when the manager is closed. Before
+    Binance drops a connection at 24 hours, a replacement is opened and only swapped in once it
+    delivers data, so messages received during the overlap may be delivered twice but none are
+    lost. Replacing a connection does not call on_open, no message was missed.
+
+    Text frames reach on_message as str by default. With raw, the frame payload bytes are passed
+    as received; with parse_json, the payload is parsed straight from the bytes, by orjson when it
+    is installed, and fields can then cut the parsed events down to the keys the consumer reads.
+
+    Keyword Args:
+        reconnect (bool, optional): whether to reconnect and resubscribe after the connection is lost. By default it's False
+        rotate_interval (int, optional): seconds after which a reconnecting manager replaces its connection. By default it's 84600
+        raw (bool, optional): whether to pass text frames as bytes. By default it's False
+        parse_json (bool, optional): whether to pass text frames parsed. By default it's False
+        json_decoder (callable, optional): function parsing the frame bytes. By default it's orjson.loads when orjson is installed, otherwise json.loads
+        fields (dict, optional): stream name -> keys kept in its events, "*" applies to every stream, requires parse_json.
+            e.g. {"!miniTicker@arr": ("s", "c")}. By default events are passed whole
+        dispatcher (MessageDispatcher, optional): queue handing messages to worker threads running on_message,
+            so slow callbacks do not stall reading. By default on_message runs in the reader thread
+    """
+
+    RECONNECT_MIN_DELAY = 1
+    RECONNECT_MAX_DELAY = 60
+    ROTATION_WAIT = 10  # seconds to wait for the replacement connection to deliver data
+
     def __init__(
         self,
         stream_url,
@@ -26,6 +59,13 @@ class BinanceSocketManager(threading.Thread):
         timeout=None,
         time_unit=None,
         proxies: Optional[dict] = None,
+        reconnect=False,
+        rotate_interval=84600,
+        raw=False,
+        parse_json=False,
+        json_decoder=None,
+        fields=None,
+        dispatcher=None,
     ):
         threading.Thread.__init__(self)
         if not logger:
@@ -47,7 +87,24 @@ class BinanceSocketManager(threading.Thread):
         self.on_error = on_error
         self.timeout = timeout
 
+        self.reconnect = reconnect
+        self.rotate_interval = rotate_interval
+        self.streams = {}  # subscribed stream names in subscription order
+        self.connected_at = None
+        if fields and not parse_json:
+            raise ValueError("fields requires parse_json")
+        self.raw = raw
+        self.parse_json = parse_json
+        self.json_decoder = json_decoder or default_json_decoder
+        self.fields = (
+            {stream: tuple(keys) for stream, keys in fields.items()} if fields else None
+        )
+        self.dispatcher = dispatcher
+
         self._proxy_params = parse_proxies(proxies) if proxies else {}
+        self._closing = threading.Event()
+        self._ws_lock = threading.Lock()
+        self._streams_lock = threading.Lock()
 
         self.create_ws_connection()
 
@@ -56,16 +113,148 @@ class BinanceSocketManager(threading.Thread):
             f"Creating connection with WebSocket Server: {self.stream_url}, proxies: {self._proxy_params}",
         )
 
-        self.ws = create_connection(
-            self.stream_url, timeout=self.timeout, **self._proxy_params
-        )
+        self.ws, _ = self._open_connection()
+        self.connected_at = time.time()
         self.logger.debug(
             f"WebSocket connection has been established: {self.stream_url}, proxies: {self._proxy_params}",
         )
         self._callback(self.on_open)
 
+    def _open_connection(self):
+        ws = create_connection(
+            self.stream_url, timeout=self.timeout, **self._proxy_params
+        )
+        with self._streams_lock:
+            streams = list(self.streams)
+        self._send_streams(ws, "SUBSCRIBE", streams)
+        return ws, streams
+
+    def _send_streams(self, ws, method, streams):
+        if streams:
+            self.logger.debug("%s %s on new connection", method, streams)
+            message = {"method": method, "params": streams, "id": get_timestamp()}
+            ws.send(json.dumps(message))
+
+    def _sync_streams(self, ws, subscribed):
+        """Apply to ws the subscriptions changed since the subscribed list was taken"""
+
+        with self._streams_lock:
+            streams = list(self.streams)
+        added = [stream for stream in streams if stream not in subscribed]
+        removed = [stream for stream in subscribed if stream not in streams]
+        self._send_streams(ws, "SUBSCRIBE", added)
+        self._send_streams(ws, "UNSUBSCRIBE", removed)
+
+    def add_streams(self, streams):
+        """Remember subscribed streams, they are subscribed again on every new connection"""
+
+        with self._streams_lock:
+            self.streams.update(dict.fromkeys(streams))
+
+    def remove_streams(self, streams):
+        with self._streams_lock:
+            for stream in streams:
+                self.streams.pop(stream, None)
+
     def run(self):
-        self.read_data()
+        if self.dispatcher is None:
+            self._run()
+            return
+        self.dispatcher.start(self._dispatch)
+        try:
+            self._run()
+        finally:
+            self.dispatcher.close()
+
+    def _dispatch(self, message):
+        self._callback(self.on_message, message)
+
+    def _run(self):
+        if not self.reconnect:
+            self.read_data()
+            return
+        if self.rotate_interval:
+            threading.Thread(target=self._rotate_periodically, daemon=True).start()
+        while not self._closing.is_set():
+            self.read_data()
+            if not self._closing.is_set():
+                self._reconnect(self.ws)
+        self._callback(self.on_close)
+
+    def _reconnect(self, lost_ws):
+        lost_ws.shutdown()
+        attempt = 0
+        while True:
+            delay = random.uniform(
+                0,
+                min(self.RECONNECT_MAX_DELAY, self.RECONNECT_MIN_DELAY * 2**attempt),
+            )
+            self.logger.warning(
+                "Reconnecting to %s in %.1f seconds", self.stream_url, delay
+            )
+            if self._closing.wait(delay):
+                return
+            try:
+                with self._ws_lock:
+                    # a rotation already replaced the lost connection
+                    if self.ws is not lost_ws:
+                        return
+                    self.create_ws_connection()
+                return
+            except Exception as e:
+                self.logger.error("Reconnect failed: {}".format(e))
+                attempt += 1
+
+    def _rotate_periodically(self):
+        while not self._closing.wait(
+            max(self.connected_at + self.rotate_interval - time.time(), 1)
+        ):
+            if time.time() - self.connected_at < self.rotate_interval:
+                continue
+            try:
+                self._rotate()
+            except Exception as e:
+                self.logger.error("Websocket rotation failed: {}".format(e))
+                self._closing.wait(self.RECONNECT_MAX_DELAY)
+
+    def _rotate(self):
+        old_ws = self.ws
+        self.logger.info("Replacing websocket connection: %s", self.stream_url)
+        new_ws, subscribed = self._open_connection()
+        try:
+            self._await_data(new_ws)
+        except Exception:
+            new_ws.shutdown()
+            raise
+        with self._ws_lock:
+            if self.ws is not old_ws or self._closing.is_set():
+                new_ws.shutdown()
+                return
+            self.ws = new_ws
+            self.connected_at = time.time()
+            # subscribe and unsubscribe calls made while waiting went to the old connection
+            self._sync_streams(new_ws, subscribed)
+        # the reader drains the old connection until its CLOSE frame, then moves to the new one
+        try:
+            old_ws.send_close()
+        except Exception:
+            old_ws.abort()
+        if not self._closing.wait(self.ROTATION_WAIT):
+            old_ws.abort()
+
+    def _await_data(self, ws):
+        """Read the replacement connection until it delivers stream data, the same data still arrives on the old one"""
+
+        ws.settimeout(1)
+        deadline = time.time() + self.ROTATION_WAIT
+        while time.time() < deadline:
+            try:
+                op_code, frame = ws.recv_data_frame(True)
+            except WebSocketTimeoutException:
+                continue
+            if op_code == ABNF.OPCODE_TEXT and not frame.data.startswith(b'{"result"'):
+                break
+        ws.settimeout(self.timeout)
 
     def send_message(self, message):
         self.logger.debug("Sending message to Binance WebSocket Server: %s", message)
@@ -77,22 +266,20 @@ class BinanceSocketManager(threading.Thread):
     def read_data(self):
         data = ""
         while True:
+            ws = self.ws
             try:
-                op_code, frame = self.ws.recv_data_frame(True)
-            except WebSocketException as e:
-                if isinstance(e, WebSocketConnectionClosedException):
-                    self.logger.error("Lost websocket connection")
-                elif isinstance(e, WebSocketTimeoutException):
-                    self.logger.error("Websocket connection timeout")
-                else:
-                    self.logger.error("Websocket exception: {}".format(e))
-                self._handle_exception(e)
-                break
+                op_code, frame = ws.recv_data_frame(True)
             except Exception as e:
-                self.logger.error("Exception in read_data: {}".format(e))
-                self._handle_exception(e)
+                if ws is not self.ws:
+                    # replaced by a rotation, continue on the new connection
+                    continue
+                self._handle_read_error(e)
                 break
 
+            if op_code == ABNF.OPCODE_CLOSE and ws is not self.ws:
+                ws.shutdown()
+                continue
+
             self._handle_data(op_code, frame, data)
             self._handle_heartbeat(op_code, frame)
 
@@ -100,9 +287,21 @@ class BinanceSocketManager(threading.Thread):
                 self.logger.warning(
                     "CLOSE frame received, closing websocket connection"
                 )
-                self._callback(self.on_close)
+                if not self.reconnect:
+                    self._callback(self.on_close)
                 break
 
+    def _handle_read_error(self, e):
+        if isinstance(e, WebSocketConnectionClosedException):
+            self.logger.error("Lost websocket connection")
+        elif isinstance(e, WebSocketTimeoutException):
+            self.logger.error("Websocket connection timeout")
+        elif isinstance(e, WebSocketException):
+            self.logger.error("Websocket exception: {}".format(e))
+        else:
+            self.logger.error("Exception in read_data: {}".format(e))
+        self._handle_exception(e)
+
     def _handle_heartbeat(self, op_code, frame):
         if op_code == ABNF.OPCODE_PING:
             self._callback(self.on_ping, frame.data)
@@ -114,10 +313,38 @@ class BinanceSocketManager(threading.Thread):
 
     def _handle_data(self, op_code, frame, data):
         if op_code == ABNF.OPCODE_TEXT:
-            data = frame.data.decode("utf-8")
-            self._callback(self.on_message, data)
+            if self.raw:
+                data = frame.data
+            elif self.parse_json:
+                try:
+                    data = self.json_decoder(frame.data)
+                except ValueError as e:
+                    self.logger.error("Invalid JSON message: {}".format(e))
+                    self._handle_exception(e)
+                    return
+                if self.fields:
+                    data = self._filter_fields(data)
+            else:
+                data = frame.data.decode("utf-8")
+            if self.dispatcher is not None:
+                self.dispatcher.put(_stream_name(data), data)
+            else:
+                self._callback(self.on_message, data)
+
+    def _filter_fields(self, message):
+        if isinstance(message, dict) and "stream" in message and "data" in message:
+            keys = self.fields.get(message["stream"], self.fields.get("*"))
+            if keys:
+                message["data"] = _select_fields(message["data"], keys)
+            return message
+        keys = self.fields.get("*")
+        # raw stream events, but not replies to SUBSCRIBE and other requests
+        if keys and not _is_reply(message):
+            return _select_fields(message, keys)
+        return message
 
     def close(self):
+        self._closing.set()
         if not self.ws.connected:
             self.logger.warning("Websocket already closed")
         else:
@@ -134,5 +361,35 @@ class BinanceSocketManager(threading.Thread):
     def _handle_exception(self, e):
         if self.on_error:
             self.on_error(self, e)
-        else:
+        elif not self.reconnect:
             raise e
+
+
+def _is_reply(message):
+    return (
+        isinstance(message, dict)
+        and "id" in message
+        and ("result" in message or "error" in message)
+    )
+
+
+def _select_fields(data, keys):
+    if isinstance(data, list):
+        return [_select_fields(item, keys) for item in data]
+    if isinstance(data, dict):
+        return {key: data[key] for key in keys if key in data}
+    return data
+
+
+def _stream_name(message):
+    """Stream name of a combined stream message, None for other messages"""
+
+    if isinstance(message, dict):
+        return message.get("stream")
+    prefix = '{"stream":"' if isinstance(message, str) else b'{"stream":"'
+    if not message.startswith(prefix):
+        return None
+    start = len(prefix)
+    end = message.find(prefix[-1:], start)
+    name = message[start:end]
+    return name if isinstance(name, str) else name.decode("utf-8")
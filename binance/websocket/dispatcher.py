@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import deque
+
+
+class MessageDispatcher(object):
+    """Bounded queue between a socket reader thread and a pool of callback workers
+
+    Each stream has its own queue of at most maxsize messages. A full queue is handled
+    by the stream's policy:
+    - "block": the reader waits for a free slot, backpressure that also delays pings.
+    - "drop_oldest": the oldest queued message of the stream is dropped.
+    - "coalesce_latest": only the latest message of the stream is kept, whatever the queue size.
+    Workers take turns over the streams with queued messages and never run two messages of the
+    same stream at once, so every stream is delivered in order. Messages of a combined stream are
+    keyed by their stream name, all other messages share one queue.
+
+    Keyword Args:
+        maxsize (int, optional): capacity of the queue of each stream. By default it's 10000
+        workers (int, optional): number of worker threads running the callback. By default it's 1
+        policy (str, optional): policy of the streams not in policies. By default it's "block"
+        policies (dict, optional): stream name -> policy
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE_LATEST = "coalesce_latest"
+
+    def __init__(self, maxsize=10000, workers=1, policy=BLOCK, policies=None):
+        policies = policies or {}
+        for name in [policy, *policies.values()]:
+            if name not in (self.BLOCK, self.DROP_OLDEST, self.COALESCE_LATEST):
+                raise ValueError("Invalid dispatch policy: {}".format(name))
+        self.maxsize = maxsize
+        self.workers = workers
+        self.policy = policy
+        self.policies = policies
+        self.queued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.lag = 0.0  # seconds the last processed message waited in the queue
+        self.max_lag = 0.0
+        self._queues = {}  # stream -> deque of (message, enqueued at)
+        self._ready = deque()  # streams with queued messages and no running worker
+        self._scheduled = set()  # streams in _ready or being processed
+        self._threads = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self._logger = logging.getLogger(__name__)
+
+    def start(self, handler):
+        """Start the workers calling handler(message)"""
+
+        with self._condition:
+            self._closed = False
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, args=(handler,), daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def close(self, timeout=None):
+        """Stop the workers once the queued messages are processed"""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def put(self, stream, message):
+        policy = self.policies.get(stream, self.policy)
+        with self._condition:
+            queue = self._queues.get(stream)
+            if queue is None:
+                queue = self._queues[stream] = deque()
+            if policy == self.COALESCE_LATEST and queue:
+                self.coalesced += len(queue)
+                self.queued -= len(queue)
+                queue.clear()
+            elif len(queue) >= self.maxsize:
+                if policy == self.DROP_OLDEST:
+                    queue.popleft()
+                    self.queued -= 1
+                    self.dropped += 1
+                else:
+                    while len(queue) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+            queue.append((message, time.time()))
+            self.queued += 1
+            if stream not in self._scheduled:
+                self._scheduled.add(stream)
+                self._ready.append(stream)
+                self._condition.notify()
+
+    def stats(self):
+        """Queue depth, drops and lag counters"""
+
+        with self._condition:
+            return {
+                "queued": self.queued,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "lag": self.lag,
+                "max_lag": self.max_lag,
+                "streams": {
+                    stream: len(queue)
+                    for stream, queue in self._queues.items()
+                    if queue
+                },
+            }
+
+    def _work(self, handler):
+        while True:
+            with self._condition:
+                while not self._ready and not self._closed:
+                    self._condition.wait()
+                if not self._ready:
+                    return
+                stream = self._ready.popleft()
+                message, enqueued_at = self._queues[stream].popleft()
+                self.queued -= 1
+                # a blocked reader may be waiting for this slot
+                self._condition.notify_all()
+            lag = time.time() - enqueued_at
+            try:
+                handler(message)
+            except Exception as e:
+                self._logger.error("Error from message handler: {}".format(e))
+            with self._condition:
+                self.processed += 1
+                self.lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                if self._queues[stream]:
+                    self._ready.append(stream)
+                    self._condition.notify()
+                else:
+                    self._scheduled.discard(stream)
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from binance.api import default_json_decoder
+
+
+class LatestValues(object):
+    """Latest event per symbol of book_ticker, mini_ticker and ticker streams
+
+    Used as on_message of a stream client, single symbol, all market (@arr) and combined stream
+    messages are accepted, raw or parsed. The reader thread only parses the message and
+    overwrites one slot per symbol, intermediate updates are never queued. Consumers read the
+    latest values with get() or snapshot(), or receive them through on_update, called from its
+    own thread at most once per interval with the symbols updated since the previous call.
+
+    Keyword Args:
+        on_update (callable, optional): called with {symbol: event} of the symbols updated since the previous call
+        interval (float, optional): minimum seconds between two on_update calls. By default it's 0.1
+        json_decoder (callable, optional): function parsing str and bytes messages. By default it's orjson.loads when orjson is installed, otherwise json.loads
+    """
+
+    def __init__(self, on_update=None, interval=0.1, json_decoder=None):
+        self.on_update = on_update
+        self.interval = interval
+        self.json_decoder = json_decoder or default_json_decoder
+        self.updates = 0
+        self._values = {}
+        self._updated = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._logger = logging.getLogger(__name__)
+        if on_update is not None:
+            threading.Thread(target=self._notify, daemon=True).start()
+
+    def on_message(self, _, message):
+        if isinstance(message, (str, bytes)):
+            message = self.json_decoder(message)
+        if isinstance(message, dict) and "data" in message:
+            message = message["data"]
+        events = message if isinstance(message, list) else [message]
+        with self._lock:
+            for event in events:
+                symbol = event.get("s")
+                if symbol is None:
+                    continue
+                self._values[symbol] = event
+                self._updated[symbol] = event
+                self.updates += 1
+
+    def get(self, symbol):
+        """Latest event of a symbol, None before the first one"""
+
+        return self._values.get(symbol)
+
+    def snapshot(self):
+        """Copy of the latest event of every symbol, taken between two messages"""
+
+        with self._lock:
+            return dict(self._values)
+
+    def close(self):
+        """Stop calling on_update"""
+
+        self._closed.set()
+
+    def _notify(self):
+        while not self._closed.wait(self.interval):
+            with self._lock:
+                updated, self._updated = self._updated, {}
+            if not updated:
+                continue
+            try:
+                self.on_update(updated)
+            except Exception as e:
+                self._logger.error("Error from on_update: {}".format(e))
@@ -1,5 +1,6 @@
 from typing import Optional
 
+from binance.lib.authentication import HmacSigner
 from binance.websocket.websocket_client import BinanceWebsocketClient
 
 
@@ -19,9 +20,13 @@ class SpotWebsocketAPIClient(BinanceWebsocketClient):
         time_unit=None,
         logger=None,
         proxies: Optional[dict] = None,
+        clock=None,
     ):
         self.api_key = api_key
         self.api_secret = api_secret
+        self.signer = HmacSigner(api_secret) if api_secret else None
+        # server time estimate for signed requests, usually shared with a REST client
+        self.clock = clock
 
         super().__init__(
             stream_url,
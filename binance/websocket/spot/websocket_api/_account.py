@@ -87,7 +87,9 @@ def account(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "account.status",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -150,7 +152,9 @@ def order_rate_limit(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "account.rateLimits.orders",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -234,7 +238,9 @@ def order_history(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "allOrders",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -311,7 +317,9 @@ def oco_history(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "allOrderLists",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -386,7 +394,9 @@ def my_trades(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "myTrades",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -463,7 +473,9 @@ def prevented_matches(self, symbol: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "myPreventedMatches",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -92,7 +92,9 @@ def new_order(self, symbol: str, side: str, type: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "order.place",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -169,7 +171,9 @@ def new_order_test(self, symbol: str, side: str, type: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "order.test",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -255,7 +259,9 @@ def get_order(self, symbol: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "order.status",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -336,7 +342,9 @@ def cancel_order(self, symbol: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "order.cancel",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
 
     self.send(payload)
@@ -523,7 +531,9 @@ def cancel_replace_order(
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "order.cancelReplace",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -599,7 +609,9 @@ def get_open_orders(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "openOrders.status",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -732,7 +744,9 @@ def cancel_open_orders(self, symbol: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "openOrders.cancelAll",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -907,7 +921,9 @@ def new_oco_order(
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "orderList.place.oco",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -1075,7 +1091,9 @@ def new_oto_order(
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "orderList.place.oto",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -1276,7 +1294,9 @@ def new_otoco_order(
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "orderList.place.otoco",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -1352,7 +1372,9 @@ def get_oco_order(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "orderList.status",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -1466,7 +1488,9 @@ def cancel_oco_order(self, symbol: str, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "orderList.cancel",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
 
@@ -1540,6 +1564,8 @@ def get_open_oco_orders(self, **kwargs):
     payload = {
         "id": parameters.pop("id", get_uuid()),
         "method": "openOrderLists.status",
-        "params": websocket_api_signature(self.api_key, self.api_secret, parameters),
+        "params": websocket_api_signature(
+            self.api_key, self.api_secret, parameters, self.signer, self.clock
+        ),
     }
     self.send(payload)
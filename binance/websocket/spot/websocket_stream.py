@@ -18,6 +18,13 @@ class SpotWebsocketStreamClient(BinanceWebsocketClient):
         time_unit=None,
         logger=None,
         proxies: Optional[dict] = None,
+        reconnect=False,
+        rotate_interval=84600,
+        raw=False,
+        parse_json=False,
+        json_decoder=None,
+        fields=None,
+        dispatcher=None,
     ):
         if is_combined:
             stream_url = stream_url + "/stream"
@@ -35,6 +42,13 @@ class SpotWebsocketStreamClient(BinanceWebsocketClient):
             time_unit=time_unit,
             logger=logger,
             proxies=proxies,
+            reconnect=reconnect,
+            rotate_interval=rotate_interval,
+            raw=raw,
+            parse_json=parse_json,
+            json_decoder=json_decoder,
+            fields=fields,
+            dispatcher=dispatcher,
         )
 
     def agg_trade(self, symbol: str, id=None, action=None, **kwargs):
@@ -0,0 +1,131 @@
+import math
+import threading
+
+from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
+
+
+class SpotWebsocketStreamPool(object):
+    """Combined streams spread over several connections, each with its own reader thread
+
+    Every connection (shard) is a combined SpotWebsocketStreamClient with at most max_streams
+    streams. The pool keeps max(connections, streams / max_streams) shards, never more than
+    there are streams. New streams go to the least loaded shards. After every subscribe and
+    unsubscribe the loads are evened out and shards that are no longer needed are stopped.
+    A stream is subscribed on its new shard before it is unsubscribed from the old one, so a
+    move can duplicate messages but does not drop any.
+    All shards share the callbacks, which receive the shard's socket manager as first argument.
+    Reading and JSON parsing are spread over one thread per shard, the GIL still serializes
+    pure Python callbacks.
+
+    Keyword Args:
+        connections (int, optional): minimum number of shards while there are enough streams. By default it's 1
+        max_streams (int, optional): maximum number of streams of a shard, Binance accepts up to 1024. By default it's 200
+        The other keyword arguments are passed to every SpotWebsocketStreamClient, e.g. reconnect or parse_json.
+    """
+
+    def __init__(
+        self,
+        stream_url="wss://stream.binance.com:9443",
+        on_message=None,
+        on_open=None,
+        on_close=None,
+        on_error=None,
+        connections=1,
+        max_streams=200,
+        **kwargs
+    ):
+        self.stream_url = stream_url
+        self.on_message = on_message
+        self.on_open = on_open
+        self.on_close = on_close
+        self.on_error = on_error
+        self.connections = connections
+        self.max_streams = max_streams
+        self.client_kwargs = kwargs
+        self.shards = []
+        self._lock = threading.Lock()
+
+    @property
+    def streams(self):
+        """Subscribed stream names"""
+
+        return [stream for shard in self.shards for stream in _streams(shard)]
+
+    def subscribe(self, stream):
+        streams = [stream] if isinstance(stream, str) else stream
+        with self._lock:
+            subscribed = set(self.streams)
+            new = [s for s in dict.fromkeys(streams) if s not in subscribed]
+            if not new:
+                return
+            target = self._target(len(subscribed) + len(new))
+            while len(self.shards) < target:
+                self.shards.append(self._create_shard())
+            self._place(new, self.shards)
+            self._rebalance()
+
+    def unsubscribe(self, stream):
+        streams = set([stream] if isinstance(stream, str) else stream)
+        with self._lock:
+            for shard in self.shards:
+                removed = [s for s in _streams(shard) if s in streams]
+                if removed:
+                    shard.unsubscribe(removed)
+            self._rebalance()
+
+    def stop(self):
+        with self._lock:
+            for shard in self.shards:
+                shard.stop()
+            self.shards = []
+
+    def _target(self, count):
+        if count == 0:
+            return 0
+        return max(min(self.connections, count), math.ceil(count / self.max_streams))
+
+    def _create_shard(self):
+        return SpotWebsocketStreamClient(
+            stream_url=self.stream_url,
+            on_message=self.on_message,
+            on_open=self.on_open,
+            on_close=self.on_close,
+            on_error=self.on_error,
+            is_combined=True,
+            **self.client_kwargs
+        )
+
+    def _place(self, streams, shards):
+        """Subscribe streams on the least loaded shards, one SUBSCRIBE per shard"""
+
+        loads = {shard: len(_streams(shard)) for shard in shards}
+        batches = {}
+        for stream in streams:
+            shard = min(shards, key=loads.get)
+            loads[shard] += 1
+            batches.setdefault(shard, []).append(stream)
+        for shard, batch in batches.items():
+            shard.subscribe(batch)
+
+    def _rebalance(self):
+        target = self._target(len(self.streams))
+        while len(self.shards) > target:
+            shard = min(self.shards, key=lambda shard: len(_streams(shard)))
+            self.shards.remove(shard)
+            if self.shards:
+                self._place(_streams(shard), self.shards)
+            shard.stop()
+
+        while len(self.shards) > 1:
+            ordered = sorted(self.shards, key=lambda shard: len(_streams(shard)))
+            lightest, heaviest = ordered[0], ordered[-1]
+            count = (len(_streams(heaviest)) - len(_streams(lightest))) // 2
+            if count == 0:
+                break
+            moved = _streams(heaviest)[-count:]
+            lightest.subscribe(moved)
+            heaviest.unsubscribe(moved)
+
+
+def _streams(shard):
+    return list(shard.socket_manager.streams)
@@ -23,6 +23,13 @@ class BinanceWebsocketClient:
         timeout=None,
         time_unit=None,
         proxies: Optional[dict] = None,
+        reconnect=False,
+        rotate_interval=84600,
+        raw=False,
+        parse_json=False,
+        json_decoder=None,
+        fields=None,
+        dispatcher=None,
     ):
         if not logger:
             logger = logging.getLogger(__name__)
@@ -39,6 +46,13 @@ class BinanceWebsocketClient:
             timeout,
             time_unit,
             proxies,
+            reconnect,
+            rotate_interval,
+            raw,
+            parse_json,
+            json_decoder,
+            fields,
+            dispatcher,
         )
 
         # start the thread
@@ -58,6 +72,13 @@ class BinanceWebsocketClient:
         timeout,
         time_unit,
         proxies,
+        reconnect=False,
+        rotate_interval=84600,
+        raw=False,
+        parse_json=False,
+        json_decoder=None,
+        fields=None,
+        dispatcher=None,
     ):
         return BinanceSocketManager(
             stream_url,
@@ -71,6 +92,13 @@ class BinanceWebsocketClient:
             timeout=timeout,
             time_unit=time_unit,
             proxies=proxies,
+            reconnect=reconnect,
+            rotate_interval=rotate_interval,
+            raw=raw,
+            parse_json=parse_json,
+            json_decoder=json_decoder,
+            fields=fields,
+            dispatcher=dispatcher,
         )
 
     def _single_stream(self, stream):
@@ -97,6 +125,7 @@ class BinanceWebsocketClient:
             id = get_timestamp()
         if self._single_stream(stream):
             stream = [stream]
+        self.socket_manager.add_streams(stream)
         json_msg = json.dumps({"method": "SUBSCRIBE", "params": stream, "id": id})
         self.socket_manager.send_message(json_msg)
 
@@ -105,6 +134,7 @@ class BinanceWebsocketClient:
             id = get_timestamp()
         if self._single_stream(stream):
             stream = [stream]
+        self.socket_manager.remove_streams(stream)
         json_msg = json.dumps({"method": "UNSUBSCRIBE", "params": stream, "id": id})
         self.socket_manager.send_message(json_msg)
 
@@ -4,6 +4,16 @@ CONFIG = {
     "API_SECRET": "",
     "balance_buffer": 5, # 预留5个区间的资金进行开仓
     "WX_TOKEN": "",
+    "USE_USER_DATA_STREAM": False, # 设为True时通过用户数据流接收成交推送，REST仅用于定期对账
+    "RECONCILE_INTERVAL": 30, # 开启用户数据流时，REST对账的间隔秒数
+    "USE_BOOK_TICKER_STREAM": False, # 设为True时通过bookTicker推送获取价格，推送断开时回退到REST
+    "USE_WS_ORDER_API": False, # 设为True时通过WebSocket API批量挂入场单，连接断开时回退到REST
+    "STATE_DB": None, # 网格状态库路径，例如"grid_state.db"，重启后从中恢复点位，为None则不持久化
+    "REQUEST_WEIGHT_LIMIT": 3000, # 所有品种共享的每分钟请求权重预算
+    "CONFIG_RELOAD_INTERVAL": 10, # 重新加载SYMBOLS配置的间隔秒数，增删品种无需重启
+    "HTTP_POOL_SIZE": 20, # REST连接池大小，不小于品种数加上余额、价格等后台线程数
+    "ORDER_RETRIES": 2, # 下单超时或5xx时，确认订单不存在后用同一个newClientOrderId重试的次数
+    "SLOW_REQUEST_SECONDS": 1, # REST请求超过该耗时时记录DNS、连接、TLS、首字节各阶段耗时
 
     # 交易配置
     "SYMBOLS": {
@@ -0,0 +1,24 @@
+import logging
+import time
+
+from binance.lib.utils import config_logging
+from binance.websocket.latest_values import LatestValues
+from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
+
+config_logging(logging, logging.INFO)
+
+
+def update_handler(updated):
+    # at most once per second, only the latest ticker of each updated symbol
+    logging.info("%s symbols updated", len(updated))
+
+
+tickers = LatestValues(on_update=update_handler, interval=1)
+
+my_client = SpotWebsocketStreamClient(on_message=tickers.on_message, parse_json=True)
+my_client.mini_ticker()
+
+time.sleep(10)
+logging.info("BNBUSDT close price: %s", tickers.get("BNBUSDT")["c"])
+my_client.stop()
+tickers.close()
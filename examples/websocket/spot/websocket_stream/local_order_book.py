@@ -0,0 +1,24 @@
+import logging
+import time
+
+from binance.lib.order_book import LocalOrderBook
+from binance.lib.utils import config_logging
+from binance.spot import Spot
+from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
+
+config_logging(logging, logging.DEBUG)
+
+book = LocalOrderBook(Spot(), "BNBUSDT")
+
+my_client = SpotWebsocketStreamClient(on_message=book.on_message, reconnect=True)
+my_client.diff_book_depth(symbol="bnbusdt", speed=100)
+
+for _ in range(10):
+    time.sleep(1)
+    bids, asks = book.depth(5)
+    logging.info("update id %s, bids %s, asks %s", book.last_update_id, bids, asks)
+    if book.synced:
+        price = book.best_bid()[0]
+        logging.info("queued ahead at %s: %s", price, book.bids.quantity_ahead(price))
+
+my_client.stop()
@@ -0,0 +1,33 @@
+import logging
+import time
+
+from binance.lib.utils import config_logging
+from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
+
+config_logging(logging, logging.DEBUG)
+
+
+def message_handler(_, message):
+    logging.info(message)
+
+
+def open_handler(_):
+    # called for the first connection and after every reconnect
+    logging.info("connected")
+
+
+# lost connections are reopened and resubscribed, the connection is replaced before the 24 hour cutoff
+my_client = SpotWebsocketStreamClient(
+    on_message=message_handler,
+    on_open=open_handler,
+    is_combined=True,
+    reconnect=True,
+)
+
+
+my_client.subscribe(
+    stream=["bnbusdt@bookTicker", "ethusdt@kline_1m"],
+)
+
+time.sleep(60)
+my_client.stop()
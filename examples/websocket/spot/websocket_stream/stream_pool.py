@@ -0,0 +1,29 @@
+import logging
+import time
+
+from binance.lib.utils import config_logging
+from binance.spot import Spot
+from binance.websocket.spot.websocket_stream_pool import SpotWebsocketStreamPool
+
+config_logging(logging, logging.INFO)
+
+
+def message_handler(socket_manager, message):
+    logging.info(message)
+
+
+symbols = [
+    s["symbol"] for s in Spot().exchange_info()["symbols"] if s["status"] == "TRADING"
+]
+
+# every connection reads at most 200 streams in its own thread
+pool = SpotWebsocketStreamPool(
+    on_message=message_handler, connections=4, max_streams=200, reconnect=True
+)
+pool.subscribe(["{}@bookTicker".format(symbol.lower()) for symbol in symbols[:600]])
+
+time.sleep(10)
+pool.unsubscribe(["{}@bookTicker".format(symbol.lower()) for symbol in symbols[:300]])
+
+time.sleep(10)
+pool.stop()
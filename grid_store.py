@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+class GridStateStore:
+    """
+    网格状态存储：SQLite WAL模式，点位状态每次变化立即写入，
+    重启后据此恢复position_map和base_price，无需重新挂整个网格
+    """
+    COMPACT_EVERY = 1000  # 每写入1000次执行一次WAL检查点，截断日志文件
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS grid_levels (
+                symbol TEXT NOT NULL,
+                tick INTEGER NOT NULL,
+                entry_order_id INTEGER,
+                exit_order_id INTEGER,
+                status TEXT NOT NULL,
+                entry_price REAL NOT NULL,
+                exit_price REAL NOT NULL,
+                PRIMARY KEY (symbol, tick)
+            )"""
+        )
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS grid_state (
+                symbol TEXT PRIMARY KEY,
+                base_price REAL NOT NULL
+            )"""
+        )
+        self.writes = 0
+        self.lock = threading.Lock()
+
+    def _write(self, sql: str, params: tuple):
+        with self.lock:
+            self.conn.execute(sql, params)
+            self.writes += 1
+            if self.writes >= self.COMPACT_EVERY:
+                self.compact()
+
+    def compact(self):
+        """将WAL中的内容写回数据库并截断WAL文件"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.writes = 0
+
+    def save_level(self, symbol: str, tick: int, entry_order_id: Optional[int], exit_order_id: Optional[int],
+                   status: str, entry_price: float, exit_price: float):
+        self._write(
+            "INSERT OR REPLACE INTO grid_levels VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (symbol, tick, entry_order_id, exit_order_id, status, entry_price, exit_price),
+        )
+
+    def delete_level(self, symbol: str, tick: int):
+        self._write("DELETE FROM grid_levels WHERE symbol = ? AND tick = ?", (symbol, tick))
+
+    def save_base_price(self, symbol: str, base_price: float):
+        self._write("INSERT OR REPLACE INTO grid_state VALUES (?, ?)", (symbol, base_price))
+
+    def load_levels(self, symbol: str) -> Dict[int, dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT tick, entry_order_id, exit_order_id, status, entry_price, exit_price "
+                "FROM grid_levels WHERE symbol = ?",
+                (symbol,),
+            ).fetchall()
+        return {
+            row[0]: {
+                "entry_order_id": row[1],
+                "exit_order_id": row[2],
+                "status": row[3],
+                "entry_price": row[4],
+                "exit_price": row[5],
+            }
+            for row in rows
+        }
+
+    def load_base_price(self, symbol: str) -> Optional[float]:
+        with self.lock:
+            row = self.conn.execute("SELECT base_price FROM grid_state WHERE symbol = ?", (symbol,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self.lock:
+            self.compact()
+            self.conn.close()
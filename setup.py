@@ -38,7 +38,8 @@ setup(
     url=URL,
     keywords=["Binance", "Public API"],
     install_requires=[req for req in requirements],
-    packages=find_packages(exclude=("tests",)),
+    extras_require={"async": ["aiohttp>=3.8.0"], "orjson": ["orjson>=3.8.0"]},
+    packages=find_packages(exclude=("tests", "benchmarks")),
     classifiers=[
         "Intended Audience :: Developers",
         "Intended Audience :: Financial and Insurance Industry",
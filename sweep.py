@@ -0,0 +1,139 @@
+"""
+网格参数扫描：在进程池中用同一份本地行情回测多组参数，
+行情序列通过共享内存传给各个进程，不逐个复制
+
+用法:
+    python sweep.py FDUSDUSDT-1s-2024-01.csv --symbol FDUSDUSDT \
+        --grid '{"PRICE_INTERVAL": [0.0001, 0.0002], "MAX_ORDERS": [5, 10, 20], "balance_buffer": [3, 5]}' \
+        --output sweep_results.parquet
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import backtest
+from config import CONFIG
+
+# 工作进程中挂载的共享行情
+_shared_memory: Optional[shared_memory.SharedMemory] = None
+_columns = None
+
+
+def share_market_data(ticks: List[backtest.Tick]) -> shared_memory.SharedMemory:
+    """
+    将行情按列写入共享内存: [时间戳..., 最低价..., 最高价..., 收盘价...]，均为float64
+    """
+    count = len(ticks)
+    shm = shared_memory.SharedMemory(create=True, size=max(count * 4 * 8, 8))
+    view = shm.buf.cast("d")
+    for column in range(4):
+        view[column * count:(column + 1) * count] = array("d", (tick[column] for tick in ticks))
+    view.release()
+    return shm
+
+
+def _attach(name: str, count: int):
+    """进程池初始化：挂载共享行情，各列为零拷贝的memoryview"""
+    global _shared_memory, _columns
+    _shared_memory = shared_memory.SharedMemory(name=name)
+    view = _shared_memory.buf.cast("d")
+    _columns = [view[column * count:(column + 1) * count] for column in range(4)]
+
+
+def _run(task: dict) -> dict:
+    params = task["params"]
+    symbol_config = dict(task["symbol_config"])
+    symbol_config.update({k: v for k, v in params.items() if k != "balance_buffer"})
+    balance_buffer = params.get("balance_buffer", task["balance_buffer"])
+    result = backtest.run_backtest(
+        zip(*_columns), task["symbol"], symbol_config, balance_buffer,
+        quote_balance=task["quote_balance"], fee_rate=task["fee_rate"], fill_model=task["fill_model"],
+    )
+    return {**{f"param_{k}": v for k, v in params.items()}, **result}
+
+
+def expand_grid(grid: Dict[str, list]) -> List[dict]:
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def write_results(results: List[dict], path: str):
+    """按列写出结果，.parquet需要安装pyarrow，其他扩展名写CSV"""
+    columns: Dict[str, list] = {}
+    for result in results:
+        for key in result:
+            columns.setdefault(key, [])
+    for result in results:
+        for key, values in columns.items():
+            values.append(result.get(key))
+
+    if path.endswith(".parquet"):
+        import pyarrow
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(pyarrow.table(columns), path)
+        return
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*columns.values()))
+
+
+def run_sweep(ticks: List[backtest.Tick], symbol: str, symbol_config: dict, grid: Dict[str, list],
+              balance_buffer: int, workers: Optional[int] = None, quote_balance: Optional[float] = None,
+              fee_rate: float = 0.0, fill_model: str = "through") -> List[dict]:
+    tasks = [
+        {
+            "params": params,
+            "symbol": symbol,
+            "symbol_config": symbol_config,
+            "balance_buffer": balance_buffer,
+            "quote_balance": quote_balance,
+            "fee_rate": fee_rate,
+            "fill_model": fill_model,
+        }
+        for params in expand_grid(grid)
+    ]
+    shm = share_market_data(ticks)
+    try:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shm.name, len(ticks))) as executor:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return list(executor.map(_run, tasks, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格参数并行扫描")
+    parser.add_argument("data", help="本地klines或aggTrades数据文件(.csv/.json)")
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--grid", required=True,
+                        help='参数网格JSON，如 {"PRICE_INTERVAL": [0.0001, 0.0002], "balance_buffer": [3, 5]}')
+    parser.add_argument("--output", default="sweep_results.csv", help="结果文件，.parquet或.csv")
+    parser.add_argument("--workers", type=int, help="进程数，默认为CPU核数")
+    parser.add_argument("--quote-balance", type=float, help="初始报价资产，不填表示资金不限")
+    parser.add_argument("--fee-rate", type=float, default=0.0)
+    parser.add_argument("--fill-model", choices=["through", "touch"], default="through")
+    args = parser.parse_args()
+
+    ticks = backtest.load_market_data(args.data)
+    results = run_sweep(
+        ticks, args.symbol, CONFIG["SYMBOLS"].get(args.symbol, {}), json.loads(args.grid),
+        CONFIG["balance_buffer"], workers=args.workers, quote_balance=args.quote_balance,
+        fee_rate=args.fee_rate, fill_model=args.fill_model,
+    )
+    write_results(results, args.output)
+    print(f"完成{len(results)}组参数回测，结果已写入{args.output}")
+
+
+if __name__ == "__main__":
+    main()
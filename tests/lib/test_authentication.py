@@ -1,4 +1,11 @@
+from Crypto.PublicKey import RSA, ECC
 from binance.lib.authentication import hmac_hashing, rsa_signature, ed25519_signature
+from binance.lib.authentication import (
+    create_signer,
+    HmacSigner,
+    RsaSigner,
+    Ed25519Signer,
+)
 import pytest
 
 
@@ -142,3 +149,27 @@ MC4CAQAwBQYDK231297dsah3167bjsfdaVwBCIEIE4rJ0goma1nbu1d8T1dp//0pe40jnf8tghwRhsSY
         ed25519_signature(
             invalid_ed25519_secret_key, payload, private_key_pass=None
         ).decode("utf-8")
+
+
+def test_hmac_signer():
+    secret = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+    signer = create_signer(api_secret=secret)
+    signer.should.be.a(HmacSigner)
+    for data in ["timestamp=1578963600000", "symbol=BTCUSDT&timestamp=1"]:
+        signer.sign(data).should.equal(hmac_hashing(secret, data))
+
+
+def test_rsa_signer():
+    private_key = RSA.generate(2048).export_key().decode("utf-8")
+    signer = create_signer(private_key=private_key)
+    signer.should.be.a(RsaSigner)
+    for data in ["timestamp=1578963600000", "symbol=BTCUSDT&timestamp=1"]:
+        signer.sign(data).should.equal(rsa_signature(private_key, data))
+
+
+def test_ed25519_signer():
+    private_key = ECC.generate(curve="ed25519").export_key(format="PEM")
+    signer = create_signer(private_key=private_key)
+    signer.should.be.a(Ed25519Signer)
+    for data in ["timestamp=1578963600000", "symbol=BTCUSDT&timestamp=1"]:
+        signer.sign(data).should.equal(ed25519_signature(private_key, data))
@@ -0,0 +1,81 @@
+import time
+from email.utils import formatdate
+
+from binance.lib.clock import ClockSync
+
+
+def test_offset_from_round_trip_midpoint():
+    clock = ClockSync()
+    now = time.time()
+    clock.add_sample(now * 1000 + 1500, now, now + 0.2)
+    round(clock.offset).should.equal(1400)
+    round(clock.error).should.equal(100)
+
+
+def test_sample_with_lowest_error_wins():
+    clock = ClockSync()
+    clock.add_sample(10000 + 1500, 10.0, 10.2)
+    clock.add_sample(20000 + 1010, 20.0, 20.02)
+    clock.add_sample(30000 + 1800, 30.0, 30.4)
+    round(clock.offset).should.equal(1000)
+
+
+def test_window_drops_old_samples():
+    clock = ClockSync(window=2)
+    clock.add_sample(10000 + 1010, 10.0, 10.02)
+    clock.add_sample(20000 + 1500, 20.0, 20.2)
+    clock.add_sample(30000 + 1800, 30.0, 30.4)
+    round(clock.offset).should.equal(1400)
+
+
+def test_timestamp_applies_offset():
+    clock = ClockSync()
+    now = time.time()
+    clock.add_sample(now * 1000 + 5000, now, now)
+    (clock.timestamp() - time.time() * 1000).should.be.within(4990, 5010)
+
+
+def test_needs_sync():
+    clock = ClockSync(resync_interval=60)
+    clock.needs_sync().should.be.true
+    now = time.time()
+    clock.add_sample(now * 1000, now, now)
+    clock.needs_sync().should.be.false
+    clock.invalidate()
+    clock.needs_sync().should.be.true
+
+
+def test_date_header_is_used_before_first_sample():
+    clock = ClockSync()
+    now = time.time()
+    clock.observe_date(formatdate(now + 30, usegmt=True), now, now)
+    clock.offset.should.be.within(29000, 31500)
+
+
+def test_date_header_consistent_with_estimate():
+    clock = ClockSync()
+    now = time.time()
+    clock.add_sample(now * 1000, now, now + 0.01)
+    clock.observe_date(formatdate(now, usegmt=True), now, now + 0.01)
+    clock.samples.should.have.length_of(1)
+    clock.needs_sync().should.be.false
+
+
+def test_date_header_detects_clock_step():
+    clock = ClockSync()
+    now = time.time()
+    clock.add_sample(now * 1000, now, now + 0.01)
+    clock.observe_date(formatdate(now + 5, usegmt=True), now, now + 0.01)
+    clock.samples.should.be.empty
+    clock.needs_sync().should.be.true
+
+
+def test_sync_failure_is_retried_later():
+    class FailingClient(object):
+        def query(self, url_path):
+            raise ConnectionError()
+
+    clock = ClockSync(resync_interval=60)
+    clock.sync(FailingClient())
+    clock.samples.should.be.empty
+    clock.needs_sync().should.be.false
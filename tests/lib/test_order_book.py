@@ -0,0 +1,105 @@
+import json
+
+from binance.lib.order_book import LocalOrderBook, PriceLadder
+
+
+class SnapshotClient(object):
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = 0
+
+    def depth(self, symbol, limit=None):
+        self.calls += 1
+        return self.snapshots.pop(0)
+
+
+def snapshot(last_update_id, bids, asks):
+    return {"lastUpdateId": last_update_id, "bids": bids, "asks": asks}
+
+
+def depth_update(first, last, bids=(), asks=()):
+    return {
+        "e": "depthUpdate",
+        "s": "FDUSDUSDT",
+        "U": first,
+        "u": last,
+        "b": list(bids),
+        "a": list(asks),
+    }
+
+
+def test_ladder_keeps_best_price_first():
+    bids = PriceLadder(descending=True)
+    bids.replace([["0.9980", "100"], ["0.9982", "50"], ["0.9979", "0"]])
+    bids.set("0.9981", "20")
+    bids.set("0.9982", "0")
+    bids.levels().should.equal([(0.9981, 20.0), (0.998, 100.0)])
+    bids.best().should.equal((0.9981, 20.0))
+    bids.quantity("0.9980").should.equal(100.0)
+    bids.quantity("0.9990").should.equal(0.0)
+
+    asks = PriceLadder()
+    asks.replace([["0.9985", "30"], ["0.9983", "10"]])
+    asks.levels(1).should.equal([(0.9983, 10.0)])
+    asks.quantity_ahead("0.9984").should.equal(10.0)
+    asks.quantity_ahead("0.9985").should.equal(40.0)
+
+
+def test_buffered_events_applied_after_snapshot():
+    client = SnapshotClient(snapshot(105, [["0.9980", "100"]], [["0.9982", "50"]]))
+    book = LocalOrderBook(client, "fdusdusdt")
+
+    book.update(depth_update(101, 104, bids=[["0.9980", "1"]]))
+    book.update(depth_update(105, 107, asks=[["0.9982", "40"]]))
+    book.update(depth_update(108, 108, bids=[["0.9981", "5"]]))
+
+    client.calls.should.equal(1)
+    book.synced.should.be.true
+    book.last_update_id.should.equal(108)
+    book.best_bid().should.equal((0.9981, 5.0))
+    book.depth().should.equal(
+        ([(0.9981, 5.0), (0.998, 100.0)], [(0.9982, 40.0)]),
+    )
+
+
+def test_gap_triggers_resync():
+    client = SnapshotClient(
+        snapshot(100, [["0.9980", "100"]], [["0.9982", "50"]]),
+        snapshot(120, [["0.9979", "10"]], [["0.9981", "5"]]),
+    )
+    book = LocalOrderBook(client, "FDUSDUSDT", resync_delay=0)
+    book.update(depth_update(99, 101))
+    book.last_update_id.should.equal(101)
+
+    book.update(depth_update(110, 121, bids=[["0.9979", "0"]]))
+
+    client.calls.should.equal(2)
+    book.last_update_id.should.equal(121)
+    book.best_bid().should.be.none
+    book.best_ask().should.equal((0.9981, 5.0))
+
+
+def test_stale_snapshot_is_fetched_again():
+    client = SnapshotClient(
+        snapshot(90, [], []),
+        snapshot(102, [["0.9980", "100"]], []),
+    )
+    book = LocalOrderBook(client, "FDUSDUSDT", resync_delay=0)
+
+    book.update(depth_update(100, 101))
+    book.synced.should.be.false
+    book.update(depth_update(102, 103))
+
+    client.calls.should.equal(2)
+    book.last_update_id.should.equal(103)
+
+
+def test_combined_stream_messages():
+    client = SnapshotClient(snapshot(100, [["0.9980", "100"]], []))
+    book = LocalOrderBook(client, "FDUSDUSDT")
+    message = {"stream": "fdusdusdt@depth@100ms", "data": depth_update(100, 101)}
+
+    book.on_message(None, json.dumps(message))
+    book.on_message(None, json.dumps({"result": None, "id": 1}))
+
+    book.last_update_id.should.equal(101)
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from binance.lib.rate_limiter import RateLimiter
+
+
+def test_endpoint_weight():
+    RateLimiter.endpoint_weight("GET", "/api/v3/openOrders", {}).should.equal(80)
+    RateLimiter.endpoint_weight(
+        "GET", "/api/v3/openOrders", {"symbol": "BTCUSDT"}
+    ).should.equal(6)
+    RateLimiter.endpoint_weight("GET", "/api/v3/depth", {"limit": 1000}).should.equal(
+        50
+    )
+    RateLimiter.endpoint_weight(
+        "GET", "/api/v3/ticker/price", {"symbols": '["BTCUSDT","BNBUSDT"]'}
+    ).should.equal(4)
+    RateLimiter.endpoint_weight("POST", "/api/v3/order", {}).should.equal(1)
+    RateLimiter.endpoint_weight("GET", "/api/v3/account?timestamp=1").should.equal(20)
+
+
+def test_is_order_request():
+    RateLimiter.is_order_request("POST", "/api/v3/order").should.be.true
+    RateLimiter.is_order_request("DELETE", "/api/v3/order").should.be.true
+    RateLimiter.is_order_request("GET", "/api/v3/order").should.be.false
+
+
+def test_acquire_takes_endpoint_weight():
+    limiter = RateLimiter(weight_limit=1000, headroom=1)
+    limiter.acquire("GET", "/api/v3/allOrders", {"symbol": "BTCUSDT"})
+    limiter.weight_tokens.should.be.within(979, 981)
+
+
+def test_acquire_ignores_sapi():
+    limiter = RateLimiter(weight_limit=1000, headroom=1)
+    limiter.acquire("GET", "/sapi/v1/capital/config/getall")
+    limiter.weight_tokens.should.equal(1000)
+
+
+def test_acquire_waits_for_refill():
+    limiter = RateLimiter(weight_limit=600, headroom=1, order_reserve=0)
+    limiter.weight_tokens = 0
+    started = time.monotonic()
+    limiter.acquire("GET", "/api/v3/ping")
+    (time.monotonic() - started).should.be.within(0.05, 0.5)
+
+
+def test_query_keeps_reserve_for_orders():
+    limiter = RateLimiter(weight_limit=600, headroom=1, order_reserve=0.5)
+    limiter.weight_tokens = 300
+    started = time.monotonic()
+    limiter.acquire("POST", "/api/v3/order")
+    (time.monotonic() - started).should.be.below(0.05)
+    limiter.weight_tokens = 300
+    blocked = threading.Thread(target=limiter.acquire, args=("GET", "/api/v3/ping"))
+    blocked.start()
+    blocked.join(0.05)
+    blocked.is_alive().should.be.true
+    blocked.join(1)
+    blocked.is_alive().should.be.false
+
+
+def test_update_syncs_with_used_weight():
+    limiter = RateLimiter(weight_limit=1000, order_limit=10, headroom=1)
+    limiter.update(
+        "/api/v3/order",
+        200,
+        {"x-mbx-used-weight-1m": "900", "x-mbx-order-count-10s": "8"},
+    )
+    limiter.weight_tokens.should.be.within(100, 101)
+    limiter.order_tokens.should.be.within(2, 3)
+
+
+def test_update_backs_off_on_429():
+    limiter = RateLimiter()
+    limiter.update("/api/v3/order", 429, {"Retry-After": "2"})
+    (limiter.blocked_until - time.monotonic()).should.be.within(1.9, 2)
+    limiter.weight_tokens.should.be.below(1)
@@ -4,9 +4,15 @@ import requests
 from tests.util import random_str, mock_http_response
 from binance.__version__ import __version__
 from binance.api import API
+from binance.lib.rate_limiter import RateLimiter
+from binance.lib.http_adapter import TimedHTTPAdapter
+from binance.lib.clock import ClockSync
 from binance.error import ParameterRequiredError, ServerError
 from binance.error import ClientError
+import json
 import logging
+import re
+import time
 
 mock_item = {"key_1": "value_1", "key_2": "value_2"}
 mock_error_body = "<HTML><HEAD><META HTTP-EQUIV></HEAD></HTML>"
@@ -206,3 +212,130 @@ def test_error_response_with_400_status_code():
     url = "/test/error/response/with/400"
     client = API(base_url=mock_base_url)
     client.send_request.when.called_with("GET", url).should.throw(ClientError)
+
+
+@mock_http_response(
+    responses.GET,
+    "/api/v3/account",
+    mock_error_response,
+    429,
+    headers={"Retry-After": "3", "x-mbx-used-weight-1m": "6100"},
+)
+def test_rate_limiter_backs_off_on_429():
+    """Tests the rate limiter is paused by a 429 response"""
+
+    limiter = RateLimiter()
+    client = API(base_url=mock_base_url, rate_limiter=limiter)
+    client.send_request.when.called_with("GET", "/api/v3/account").should.throw(
+        ClientError
+    )
+    limiter.blocked_until.should.be.greater_than(time.monotonic() + 2)
+    limiter.weight_tokens.should.be.below(0)
+
+
+@mock_http_response(responses.POST, "/api/v3/order", mock_item, 200)
+def test_signed_after_rate_limiter_wait():
+    """Tests the timestamp is taken once the rate limiter lets the request through"""
+
+    class SlowLimiter(RateLimiter):
+        def acquire(self, http_method, url_path, payload=None):
+            time.sleep(0.2)
+            self.released_at = int(time.time() * 1000)
+
+    limiter = SlowLimiter()
+    client = API(
+        random_str(), random_str(), base_url=mock_base_url, rate_limiter=limiter
+    )
+    client.sign_request("POST", "/api/v3/order", {"symbol": "BNBUSDT"})
+    timestamp = int(
+        re.search("timestamp=([0-9]+)", responses.calls[0].request.url).group(1)
+    )
+    timestamp.should.be.greater_than_or_equal_to(limiter.released_at)
+
+
+def test_API_with_pool_parameters():
+    """Tests the connection pool and keep-alive parameters"""
+
+    client = API(pool_maxsize=32, max_retries=2, keep_alive=False)
+    adapter = client.session.get_adapter(mock_base_url)
+    adapter._pool_maxsize.should.equal(32)
+    adapter.max_retries.total.should.equal(2)
+    client.session.headers.should.have.key("Connection").which.should.equal("close")
+
+
+@mock_http_response(responses.GET, "/api/v3/ping", mock_item, 200)
+def test_timing_hook():
+    """Tests the timing hook is called with the request timings"""
+
+    timings = []
+    client = API(base_url=mock_base_url, timing_hook=timings.append)
+    client.send_request("GET", "/api/v3/ping").should.equal(mock_item)
+    client.session.get_adapter(mock_base_url).should.be.a(TimedHTTPAdapter)
+    timings.should.have.length_of(1)
+    timings[0]["method"].should.equal("GET")
+    timings[0]["url_path"].should.equal("/api/v3/ping")
+    timings[0]["status_code"].should.equal(200)
+    timings[0]["total"].should.be.greater_than(0)
+
+
+@mock_http_response(responses.GET, "/test/raw", mock_item, 200)
+def test_raw_parameter():
+    """Tests the raw parameter returns the body bytes"""
+
+    client = API(base_url=mock_base_url, raw=True)
+    response = client.send_request("GET", "/test/raw")
+    response.should.be.a(bytes)
+    json.loads(response).should.equal(mock_item)
+
+
+@mock_http_response(responses.GET, "/test/decoder", mock_item, 200)
+def test_json_decoder_parameter():
+    """Tests the json_decoder parameter"""
+
+    bodies = []
+
+    def decoder(content):
+        bodies.append(content)
+        return json.loads(content)
+
+    client = API(base_url=mock_base_url, json_decoder=decoder)
+    client.send_request("GET", "/test/decoder").should.equal(mock_item)
+    bodies[0].should.be.a(bytes)
+
+
+@responses.activate
+def test_clock_parameter():
+    """Tests signed requests use the clock synced with the server time"""
+
+    server_time = int(time.time() * 1000) + 60000
+    responses.add(
+        responses.GET, mock_base_url + "/api/v3/time", json={"serverTime": server_time}
+    )
+    responses.add(responses.GET, mock_base_url + "/api/v3/account", json=mock_item)
+    clock = ClockSync()
+    client = API(random_str(), random_str(), base_url=mock_base_url, clock=clock)
+    client.sign_request("GET", "/api/v3/account").should.equal(mock_item)
+    timestamp = int(
+        re.search("timestamp=([0-9]+)", responses.calls[1].request.url).group(1)
+    )
+    timestamp.should.be.within(server_time - 1000, server_time + 1000)
+    clock.needs_sync().should.be.false
+
+
+@mock_http_response(
+    responses.GET,
+    "/api/v3/account",
+    {"code": -1021, "msg": "Timestamp for this request is outside of the recvWindow."},
+    400,
+)
+def test_clock_invalidated_on_timestamp_error():
+    """Tests the clock is resynced after a -1021 error"""
+
+    clock = ClockSync()
+    now = time.time()
+    clock.add_sample(now * 1000, now, now)
+    client = API(random_str(), random_str(), base_url=mock_base_url, clock=clock)
+    client.sign_request.when.called_with("GET", "/api/v3/account").should.throw(
+        ClientError
+    )
+    clock.needs_sync().should.be.true
@@ -0,0 +1,88 @@
+import pytest
+
+import arbitrage
+from backtest import SimulatedExchange
+from binance.error import ServerError
+
+symbol = "FDUSDUSDT"
+
+
+class FlakyExchange(SimulatedExchange):
+    """Fails the next cancel_and_replace like a timed out request
+
+    timeout is "after_cancel" when only the old order was cancelled, "after_replace" when the
+    new order was placed too.
+    """
+
+    timeout = None
+
+    def cancel_and_replace(self, symbol, side, type, cancelReplaceMode, **kwargs):
+        timeout, self.timeout = self.timeout, None
+        if timeout == "after_cancel":
+            self.cancel_order(symbol, orderId=kwargs["cancelOrderId"])
+        else:
+            response = super().cancel_and_replace(
+                symbol, side, type, cancelReplaceMode, **kwargs
+            )
+            if timeout is None:
+                return response
+        raise ServerError(504, "Gateway Time-out")
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    exchange = FlakyExchange(symbol)
+    monkeypatch.setattr(arbitrage.logger, "handlers", [])
+    monkeypatch.setattr(arbitrage, "spot_client", exchange)
+    monkeypatch.setattr(arbitrage, "ORDER_RETRY_DELAY", 0)
+    return exchange
+
+
+def replace_params(exchange):
+    old_order = exchange.new_order(symbol, "BUY", "LIMIT", 10, 0.9980)
+    return {
+        "symbol": symbol,
+        "side": "BUY",
+        "type": "LIMIT",
+        "timeInForce": "GTC",
+        "quantity": 10,
+        "price": 0.9984,
+        "newClientOrderId": arbitrage.client_order_id(9984, "BUY"),
+        "cancelReplaceMode": "STOP_ON_FAILURE",
+        "cancelOrderId": old_order["orderId"],
+    }
+
+
+def test_replace_confirmed_after_the_last_uncertain_attempt(exchange, monkeypatch):
+    monkeypatch.setattr(arbitrage, "order_retries", 0)
+    params = replace_params(exchange)
+    exchange.timeout = "after_replace"
+
+    result = arbitrage.cancel_and_replace(params)
+
+    result["cancelResult"].should.equal("SUCCESS")
+    result["newOrderResult"].should.equal("SUCCESS")
+    result["newOrderResponse"]["clientOrderId"].should.equal(params["newClientOrderId"])
+    list(exchange.open_orders).should.equal([result["newOrderResponse"]["orderId"]])
+
+
+def test_new_order_placed_when_the_cancel_already_succeeded(exchange):
+    params = replace_params(exchange)
+    exchange.timeout = "after_cancel"
+
+    result = arbitrage.cancel_and_replace(params)
+
+    result["cancelResult"].should.equal("SUCCESS")
+    result["newOrderResult"].should.equal("SUCCESS")
+    exchange.orders[params["cancelOrderId"]]["status"].should.equal("CANCELED")
+    list(exchange.open_orders).should.equal([result["newOrderResponse"]["orderId"]])
+
+
+def test_replace_fails_when_the_old_order_is_filled(exchange):
+    params = replace_params(exchange)
+    exchange.match((0, 0.9970, 0.9980, 0.9975))
+
+    result = arbitrage.cancel_and_replace(params, confirm_first=True)
+
+    result["cancelResult"].should.equal("FAILURE")
+    exchange.open_orders.should.be.empty
@@ -0,0 +1,156 @@
+import asyncio
+import re
+import time
+
+import pytest
+
+from binance.async_api import AsyncAPI
+from binance.error import ClientError, ServerError
+from binance.lib.rate_limiter import RateLimiter
+from binance.spot.async_spot import AsyncSpot
+
+aiohttp_web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+mock_error_response = {
+    "code": -1102,
+    "msg": "Mandatory parameter 'type' was not sent, was empty/null, or malformed.",
+}
+
+
+async def echo(request):
+    return aiohttp_web.json_response(
+        {
+            "method": request.method,
+            "path": request.path_qs,
+            "api_key": request.headers.get("X-MBX-APIKEY"),
+        },
+        headers={"x-mbx-used-weight-1m": "5"},
+    )
+
+
+async def client_error(request):
+    return aiohttp_web.json_response(mock_error_response, status=400)
+
+
+async def server_error(request):
+    return aiohttp_web.Response(text="<html></html>", status=502)
+
+
+def run_with_server(test, **client_kwargs):
+    async def main():
+        app = aiohttp_web.Application()
+        app.router.add_route("*", "/test/client/error", client_error)
+        app.router.add_route("*", "/test/server/error", server_error)
+        app.router.add_route("*", "/{tail:.*}", echo)
+        async with test_utils.TestServer(app) as server:
+            base_url = str(server.make_url("")).rstrip("/")
+            async with AsyncSpot(
+                "api_key", "api_secret", base_url=base_url, **client_kwargs
+            ) as client:
+                return await test(client)
+
+    return asyncio.run(main())
+
+
+def test_AsyncAPI_initial():
+    """Tests the AsyncAPI initialization"""
+
+    client = AsyncAPI("api_key")
+    client.session.should.be.none
+    client.headers.should.have.key("X-MBX-APIKEY").which.should.equal("api_key")
+    client.headers.should_not.have.key("Connection")
+    AsyncAPI(keep_alive=False).headers.should.have.key("Connection").which.should.equal(
+        "close"
+    )
+
+
+def test_query():
+    """Tests a public endpoint"""
+
+    response = run_with_server(lambda client: client.ticker_price("BTCUSDT"))
+    response["method"].should.equal("GET")
+    response["path"].should.equal("/api/v3/ticker/price?symbol=BTCUSDT")
+
+
+def test_sign_request():
+    """Tests a signed endpoint"""
+
+    response = run_with_server(lambda client: client.cancel_order("BTCUSDT", orderId=1))
+    response["method"].should.equal("DELETE")
+    response["path"].should.contain("/api/v3/order?symbol=BTCUSDT&orderId=1")
+    response["path"].should.contain("&signature=")
+    response["api_key"].should.equal("api_key")
+
+
+def test_signed_after_rate_limiter_wait():
+    """Tests the timestamp is taken once the rate limiter lets the request through"""
+
+    class SlowLimiter(RateLimiter):
+        def acquire(self, http_method, url_path, payload=None):
+            time.sleep(0.2)
+            self.released_at = int(time.time() * 1000)
+
+    limiter = SlowLimiter()
+    response = run_with_server(
+        lambda client: client.cancel_order("BTCUSDT", orderId=1), rate_limiter=limiter
+    )
+    timestamp = int(re.search("timestamp=([0-9]+)", response["path"]).group(1))
+    timestamp.should.be.greater_than_or_equal_to(limiter.released_at)
+
+
+def test_concurrent_requests():
+    """Tests requests running concurrently on one session"""
+
+    async def test(client):
+        return await asyncio.gather(*(client.time() for _ in range(20)))
+
+    run_with_server(test).should.have.length_of(20)
+
+
+def test_limit_usage():
+    """Tests the limit usage parameter"""
+
+    response = run_with_server(lambda client: client.ping(), show_limit_usage=True)
+    response["limit_usage"].should.equal({"x-mbx-used-weight-1m": "5"})
+
+
+def test_timing_hook():
+    """Tests the timing hook"""
+
+    timings = []
+
+    async def test(client):
+        await client.ping()
+        await client.ping()
+
+    run_with_server(test, timing_hook=timings.append)
+    [timing["reused"] for timing in timings].should.equal([False, True])
+
+
+def test_client_error():
+    """Tests ClientError is raised on 4xx responses"""
+
+    async def test(client):
+        await client.send_request("GET", "/test/client/error")
+
+    with pytest.raises(ClientError) as error:
+        run_with_server(test)
+    error.value.error_code.should.equal(-1102)
+
+
+def test_server_error():
+    """Tests ServerError is raised on 5xx responses"""
+
+    async def test(client):
+        await client.send_request("GET", "/test/server/error")
+
+    run_with_server.when.called_with(test).should.throw(ServerError)
+
+
+def test_raw():
+    """Tests the raw parameter returns the body bytes"""
+
+    response = run_with_server(lambda client: client.ping(), raw=True)
+    response.should.be.a(bytes)
+    response.should.contain(b'"method": "GET"')
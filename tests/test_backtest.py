@@ -0,0 +1,129 @@
+import pytest
+
+import arbitrage
+from backtest import SimulatedExchange, run_backtest
+
+symbol = "FDUSDUSDT"
+symbol_config = {
+    "BASE_PRICE": 0.9984,
+    "MAX_ORDERS": 3,
+    "ORDER_AMOUNT": 10,
+    "PRICE_INTERVAL": 0.0001,
+    "PROFIT_INTERVAL": 0.0001,
+}
+
+# (timestamp, low, high, close): the 0.9984 entry fills, then its take-profit at 0.9985
+ticks = [
+    (0, 0.9984, 0.9984, 0.9984),
+    (1000, 0.99835, 0.9984, 0.99835),
+    (2000, 0.99835, 0.99855, 0.9985),
+]
+
+
+@pytest.fixture(autouse=True)
+def no_log_file(monkeypatch):
+    monkeypatch.setattr(arbitrage.logger, "handlers", [])
+
+
+def connect(monkeypatch, **kwargs):
+    """Route the grid of this test to a SimulatedExchange, restored after the test"""
+
+    exchange = SimulatedExchange(symbol, **kwargs)
+    monkeypatch.setattr(arbitrage, "spot_client", exchange)
+    monkeypatch.setattr(arbitrage, "balance_buffer", 10)
+    monkeypatch.setitem(arbitrage.CONFIG, "SYMBOLS", {symbol: dict(symbol_config)})
+    monkeypatch.setattr(arbitrage, "grid_store", None)
+    monkeypatch.setattr(arbitrage, "order_gateway", None)
+    monkeypatch.setattr(
+        arbitrage, "open_order_snapshot", arbitrage.OpenOrderSnapshot(max_age=0)
+    )
+    monkeypatch.setattr(arbitrage, "price_cache", arbitrage.PriceCache(max_age=0))
+    monkeypatch.setattr(arbitrage, "send_wx_notification", lambda title, message: None)
+    return exchange
+
+
+def levels(grid):
+    return {
+        tick: (
+            order_info.entry_order_id,
+            order_info.exit_order_id,
+            order_info.status.name,
+        )
+        for tick, order_info in grid.position_map.items()
+    }
+
+
+def test_round_trip_pnl():
+    result = run_backtest(ticks, symbol, dict(symbol_config), balance_buffer=10)
+
+    result["ticks"].should.equal(3)
+    result["entry_fills"].should.equal(1)
+    result["exit_fills"].should.equal(1)
+    result["inventory"].should.equal(0)
+    result["pnl"].should.equal(pytest.approx(10 * 0.0001))
+
+
+def test_fees_are_charged_on_both_fills():
+    result = run_backtest(
+        ticks, symbol, dict(symbol_config), balance_buffer=10, fee_rate=0.001
+    )
+
+    fees = (0.9984 + 0.9985) * 10 * 0.001
+    result["pnl"].should.equal(pytest.approx(10 * 0.0001 - fees))
+
+
+def test_touch_fill_model():
+    result = run_backtest(
+        ticks[:2], symbol, dict(symbol_config), balance_buffer=10, fill_model="touch"
+    )
+
+    # the low touches the 0.9984 entry, the high never reaches the 0.9985 take-profit
+    result["entry_fills"].should.equal(1)
+    result["exit_fills"].should.equal(0)
+    result["inventory"].should.equal(10)
+
+
+def test_run_backtest_restores_module_state():
+    spot_client = arbitrage.spot_client
+    symbols = arbitrage.CONFIG["SYMBOLS"]
+    level = arbitrage.logger.level
+    run_backtest(ticks, symbol, dict(symbol_config), balance_buffer=10)
+
+    arbitrage.spot_client.should.be(spot_client)
+    arbitrage.CONFIG["SYMBOLS"].should.be(symbols)
+    arbitrage.logger.level.should.equal(level)
+
+
+def test_rejected_entries_are_not_stored(monkeypatch):
+    exchange = connect(monkeypatch, quote_balance=25)
+    grid = arbitrage.UsdcArbitrage(symbol=symbol)
+
+    exchange.match(ticks[0])
+    grid.check_and_update_orders()
+
+    # only two 10 FDUSD orders fit in 25 USDT, the third level is retried later
+    levels(grid).should.equal(
+        {9984: (1, None, "ENTRY_PLACED"), 9983: (2, None, "ENTRY_PLACED")}
+    )
+
+
+def test_restart_takes_over_unsaved_orders(monkeypatch):
+    exchange = connect(monkeypatch)
+    grid = arbitrage.UsdcArbitrage(symbol=symbol)
+    for tick in ticks[:2]:
+        exchange.match(tick)
+        grid.check_and_update_orders()
+    open_orders = sorted(exchange.open_orders)
+
+    # none of the levels reached the state store
+    restarted = arbitrage.UsdcArbitrage(symbol=symbol)
+    restarted.check_and_update_orders()
+
+    sorted(exchange.open_orders).should.equal(open_orders)
+    levels(restarted).should.equal(
+        {
+            9984: (None, 4, "WAITING_PROFIT"),
+            9983: (2, None, "ENTRY_PLACED"),
+            9982: (3, None, "ENTRY_PLACED"),
+        }
+    )
@@ -0,0 +1,70 @@
+from grid_store import GridStateStore
+
+
+def test_save_and_load_levels(tmp_path):
+    store = GridStateStore(str(tmp_path / "grid_state.db"))
+    store.save_level("FDUSDUSDT", 9984, 1, None, "ENTRY_PLACED", 0.9984, 0.9985)
+    store.save_level("FDUSDUSDT", 9983, 2, 3, "WAITING_PROFIT", 0.9983, 0.9984)
+    store.save_level("USDCUSDT", 9990, 4, None, "ENTRY_PLACED", 0.999, 0.9991)
+
+    store.load_levels("FDUSDUSDT").should.equal(
+        {
+            9984: {
+                "entry_order_id": 1,
+                "exit_order_id": None,
+                "status": "ENTRY_PLACED",
+                "entry_price": 0.9984,
+                "exit_price": 0.9985,
+            },
+            9983: {
+                "entry_order_id": 2,
+                "exit_order_id": 3,
+                "status": "WAITING_PROFIT",
+                "entry_price": 0.9983,
+                "exit_price": 0.9984,
+            },
+        }
+    )
+
+
+def test_save_level_replaces_the_tick(tmp_path):
+    store = GridStateStore(str(tmp_path / "grid_state.db"))
+    store.save_level("FDUSDUSDT", 9984, 1, None, "ENTRY_PLACED", 0.9984, 0.9985)
+    store.save_level("FDUSDUSDT", 9984, 1, 2, "WAITING_PROFIT", 0.9984, 0.9985)
+
+    levels = store.load_levels("FDUSDUSDT")
+    levels.should.have.length_of(1)
+    levels[9984]["exit_order_id"].should.equal(2)
+    levels[9984]["status"].should.equal("WAITING_PROFIT")
+
+
+def test_delete_level(tmp_path):
+    store = GridStateStore(str(tmp_path / "grid_state.db"))
+    store.save_level("FDUSDUSDT", 9984, 1, None, "ENTRY_PLACED", 0.9984, 0.9985)
+    store.save_level("FDUSDUSDT", 9983, 2, None, "ENTRY_PLACED", 0.9983, 0.9984)
+    store.delete_level("FDUSDUSDT", 9984)
+
+    list(store.load_levels("FDUSDUSDT")).should.equal([9983])
+
+
+def test_base_price(tmp_path):
+    store = GridStateStore(str(tmp_path / "grid_state.db"))
+    store.load_base_price("FDUSDUSDT").should.be.none
+
+    store.save_base_price("FDUSDUSDT", 0.9984)
+    store.save_base_price("FDUSDUSDT", 0.9986)
+    store.load_base_price("FDUSDUSDT").should.equal(0.9986)
+
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "grid_state.db")
+    store = GridStateStore(path)
+    store.COMPACT_EVERY = 2
+    store.save_base_price("FDUSDUSDT", 0.9984)
+    store.save_level("FDUSDUSDT", 9984, 1, None, "ENTRY_PLACED", 0.9984, 0.9985)
+    store.save_level("FDUSDUSDT", 9983, 2, None, "ENTRY_PLACED", 0.9983, 0.9984)
+    store.close()
+
+    store = GridStateStore(path)
+    store.load_base_price("FDUSDUSDT").should.equal(0.9984)
+    sorted(store.load_levels("FDUSDUSDT")).should.equal([9983, 9984])
@@ -0,0 +1,312 @@
+import json
+import queue
+import threading
+
+from unittest import mock
+from websocket import ABNF, WebSocketConnectionClosedException
+
+from binance.websocket.binance_socket_manager import BinanceSocketManager
+
+
+class Frame(object):
+    def __init__(self, data=b""):
+        self.data = data
+
+
+class FakeWebSocket(object):
+    """Connection returning queued frames, an exception in the queue is raised by recv"""
+
+    def __init__(self, *frames):
+        self.frames = queue.Queue()
+        for frame in frames:
+            self.put(frame)
+        self.sent = []
+        self.connected = True
+
+    def put(self, frame):
+        if isinstance(frame, str):
+            frame = (ABNF.OPCODE_TEXT, Frame(frame.encode()))
+        self.frames.put(frame)
+
+    def recv_data_frame(self, control_frame=False):
+        frame = self.frames.get(timeout=5)
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def send_close(self):
+        self.put((ABNF.OPCODE_CLOSE, Frame()))
+
+    def shutdown(self):
+        self.connected = False
+
+    def abort(self):
+        self.connected = False
+
+    def settimeout(self, timeout):
+        pass
+
+
+def create_manager(connections, **kwargs):
+    events = {"messages": [], "open": 0, "close": 0, "errors": []}
+    received = threading.Event()
+
+    def on_message(_, message):
+        events["messages"].append(message)
+        received.set()
+
+    def on_open(_):
+        events["open"] += 1
+
+    def on_close(_):
+        events["close"] += 1
+
+    def on_error(_, error):
+        events["errors"].append(error)
+        if not kwargs.get("reconnect"):
+            received.set()
+
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        side_effect=connections,
+    ) as create_connection:
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream",
+            on_message=on_message,
+            on_open=on_open,
+            on_close=on_close,
+            on_error=on_error,
+            **kwargs
+        )
+        manager.RECONNECT_MIN_DELAY = 0
+        manager.ROTATION_WAIT = 0.1
+        manager.add_streams(["btcusdt@bookTicker", "ethusdt@bookTicker"])
+        manager.start()
+        received.wait(5)
+        manager.close()
+        manager.join(5)
+    return manager, events, create_connection
+
+
+def test_streams_are_tracked():
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        return_value=FakeWebSocket(),
+    ):
+        manager = BinanceSocketManager("wss://stream.binance.com:9443/stream")
+    manager.add_streams(["btcusdt@bookTicker", "ethusdt@bookTicker"])
+    manager.add_streams(["btcusdt@bookTicker"])
+    manager.remove_streams(["ethusdt@bookTicker"])
+    list(manager.streams).should.equal(["btcusdt@bookTicker"])
+
+
+def test_connection_lost_without_reconnect():
+    first = FakeWebSocket(WebSocketConnectionClosedException())
+    manager, events, create_connection = create_manager([first])
+
+    create_connection.call_count.should.equal(1)
+    events["errors"].should.have.length_of(1)
+    events["messages"].should.be.empty
+    manager.is_alive().should.be.false
+
+
+def test_reconnect_replays_subscriptions():
+    first = FakeWebSocket(WebSocketConnectionClosedException())
+    second = FakeWebSocket('{"stream":"btcusdt@bookTicker"}')
+    manager, events, create_connection = create_manager([first, second], reconnect=True)
+
+    create_connection.call_count.should.equal(2)
+    second.sent[0]["method"].should.equal("SUBSCRIBE")
+    second.sent[0]["params"].should.equal(["btcusdt@bookTicker", "ethusdt@bookTicker"])
+    events["messages"].should.equal(['{"stream":"btcusdt@bookTicker"}'])
+    events["open"].should.equal(2)
+    events["close"].should.equal(1)
+    manager.is_alive().should.be.false
+
+
+def test_rotation_overlaps_connections():
+    first = FakeWebSocket()
+    second = FakeWebSocket('{"result":null,"id":1}', '{"u":1}', '{"u":2}')
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        side_effect=[first, second],
+    ):
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream",
+            on_message=lambda _, message: messages.append(message),
+            reconnect=True,
+            rotate_interval=0,
+        )
+        manager.ROTATION_WAIT = 0.1
+        messages = []
+        manager.add_streams(["btcusdt@depth@100ms"])
+        manager.start()
+        first.put('{"u":1}')
+        manager._rotate()
+
+    manager.ws.should.be(second)
+    first.connected.should.be.false
+    second.sent[0]["params"].should.equal(["btcusdt@depth@100ms"])
+    manager.close()
+    manager.join(5)
+    messages.should.equal(['{"u":1}', '{"u":2}'])
+
+
+def handle_frame(payload, **kwargs):
+    messages = []
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        return_value=FakeWebSocket(),
+    ):
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream",
+            on_message=lambda _, message: messages.append(message),
+            **kwargs
+        )
+    manager._handle_data(ABNF.OPCODE_TEXT, Frame(payload), None)
+    return messages[0]
+
+
+MINI_TICKERS = (
+    b'{"stream":"!miniTicker@arr","data":[{"e":"24hrMiniTicker","s":"BNBUSDT","c":"600.1","v":"1"},'
+    b'{"e":"24hrMiniTicker","s":"ETHUSDT","c":"3000.5","v":"2"}]}'
+)
+
+
+def test_text_frames_are_decoded_by_default():
+    handle_frame(b'{"e":"trade"}').should.equal('{"e":"trade"}')
+
+
+def test_raw_frames():
+    handle_frame(MINI_TICKERS, raw=True).should.be(MINI_TICKERS)
+
+
+def test_parsed_frames():
+    message = handle_frame(MINI_TICKERS, parse_json=True)
+    message["data"][1]["c"].should.equal("3000.5")
+
+
+def test_custom_json_decoder():
+    handle_frame(b"{}", parse_json=True, json_decoder=lambda _: "decoded").should.equal(
+        "decoded"
+    )
+
+
+def test_field_filter_by_stream():
+    message = handle_frame(
+        MINI_TICKERS, parse_json=True, fields={"!miniTicker@arr": ["s", "c"]}
+    )
+    message["data"].should.equal(
+        [{"s": "BNBUSDT", "c": "600.1"}, {"s": "ETHUSDT", "c": "3000.5"}]
+    )
+    handle_frame(
+        MINI_TICKERS, parse_json=True, fields={"btcusdt@trade": ["p"]}
+    ).should.equal(json.loads(MINI_TICKERS))
+
+
+def test_field_filter_for_raw_streams():
+    handle_frame(
+        b'{"e":"trade","s":"BNBUSDT","p":"600.1","q":"1"}',
+        parse_json=True,
+        fields={"*": ["s", "p"]},
+    ).should.equal({"s": "BNBUSDT", "p": "600.1"})
+    handle_frame(
+        b'{"result":null,"id":1}', parse_json=True, fields={"*": ["s"]}
+    ).should.equal({"result": None, "id": 1})
+    handle_frame(
+        b'{"error":{"code":2,"msg":"Invalid request"},"id":2}',
+        parse_json=True,
+        fields={"*": ["s"]},
+    ).should.have.key("error")
+
+
+def test_field_filter_for_book_ticker_stream():
+    handle_frame(
+        b'{"u":400900217,"s":"BNBUSDT","b":"25.35","B":"31.21","a":"25.36","A":"40.66"}',
+        parse_json=True,
+        fields={"*": ("s", "b", "a")},
+    ).should.equal({"s": "BNBUSDT", "b": "25.35", "a": "25.36"})
+
+
+def test_field_filter_requires_parsing():
+    BinanceSocketManager.when.called_with(
+        "wss://stream.binance.com:9443/stream", fields={"*": ["s"]}
+    ).should.throw(ValueError)
+
+
+def test_invalid_json_is_reported():
+    errors = []
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        return_value=FakeWebSocket(),
+    ):
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream",
+            on_error=lambda _, error: errors.append(error),
+            parse_json=True,
+        )
+    manager._handle_data(ABNF.OPCODE_TEXT, Frame(b"{"), None)
+    errors.should.have.length_of(1)
+
+
+def test_messages_go_through_dispatcher():
+    from binance.websocket.dispatcher import MessageDispatcher
+
+    threads = []
+    received = threading.Event()
+
+    def on_message(_, message):
+        threads.append(threading.current_thread())
+        received.set()
+
+    dispatcher = MessageDispatcher()
+    connection = FakeWebSocket('{"stream":"btcusdt@bookTicker","data":{}}')
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        return_value=connection,
+    ):
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream",
+            on_message=on_message,
+            dispatcher=dispatcher,
+        )
+    manager.start()
+    received.wait(5)
+    manager.close()
+    manager.join(5)
+
+    threads.should.have.length_of(1)
+    threads[0].should_not.be(manager)
+    dispatcher.stats()["processed"].should.equal(1)
+
+
+def test_rotation_applies_subscriptions_changed_while_waiting():
+    class ReplacementWebSocket(FakeWebSocket):
+        def recv_data_frame(self, control_frame=False):
+            manager.add_streams(["ethusdt@depth@100ms"])
+            manager.remove_streams(["btcusdt@depth@100ms"])
+            return super().recv_data_frame(control_frame)
+
+    first = FakeWebSocket()
+    second = ReplacementWebSocket('{"u":1}')
+    with mock.patch(
+        "binance.websocket.binance_socket_manager.create_connection",
+        side_effect=[first, second],
+    ):
+        manager = BinanceSocketManager(
+            "wss://stream.binance.com:9443/stream", reconnect=True
+        )
+        manager.ROTATION_WAIT = 0.1
+        manager.add_streams(["btcusdt@depth@100ms"])
+        manager._rotate()
+
+    [(m["method"], m["params"]) for m in second.sent].should.equal(
+        [
+            ("SUBSCRIBE", ["btcusdt@depth@100ms"]),
+            ("SUBSCRIBE", ["ethusdt@depth@100ms"]),
+            ("UNSUBSCRIBE", ["btcusdt@depth@100ms"]),
+        ]
+    )
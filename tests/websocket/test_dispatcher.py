@@ -0,0 +1,95 @@
+import threading
+
+from binance.websocket.dispatcher import MessageDispatcher
+
+
+def test_messages_are_delivered_in_order():
+    received = []
+    dispatcher = MessageDispatcher(workers=4)
+    dispatcher.start(received.append)
+    for i in range(100):
+        dispatcher.put("btcusdt@trade", i)
+    dispatcher.close(5)
+
+    received.should.equal(list(range(100)))
+    stats = dispatcher.stats()
+    stats["processed"].should.equal(100)
+    stats["queued"].should.equal(0)
+    stats["dropped"].should.equal(0)
+
+
+def test_drop_oldest():
+    dispatcher = MessageDispatcher(maxsize=3, policy="drop_oldest")
+    for i in range(5):
+        dispatcher.put("btcusdt@depth", i)
+    dispatcher.stats()["dropped"].should.equal(2)
+    dispatcher.stats()["streams"].should.equal({"btcusdt@depth": 3})
+
+    received = []
+    dispatcher.start(received.append)
+    dispatcher.close(5)
+    received.should.equal([2, 3, 4])
+
+
+def test_coalesce_latest_per_stream():
+    dispatcher = MessageDispatcher(
+        policies={
+            "btcusdt@bookTicker": "coalesce_latest",
+            "ethusdt@bookTicker": "coalesce_latest",
+        }
+    )
+    for i in range(3):
+        dispatcher.put("btcusdt@bookTicker", "btc{}".format(i))
+        dispatcher.put("ethusdt@bookTicker", "eth{}".format(i))
+        dispatcher.put("btcusdt@trade", "trade{}".format(i))
+
+    received = []
+    dispatcher.start(received.append)
+    dispatcher.close(5)
+    sorted(received).should.equal(["btc2", "eth2", "trade0", "trade1", "trade2"])
+    dispatcher.stats()["coalesced"].should.equal(4)
+
+
+def test_block_waits_for_a_free_slot():
+    release = threading.Event()
+    received = []
+
+    def slow_handler(message):
+        release.wait(5)
+        received.append(message)
+
+    dispatcher = MessageDispatcher(maxsize=1)
+    dispatcher.start(slow_handler)
+    dispatcher.put(None, 1)
+    dispatcher.put(None, 2)
+
+    writer = threading.Thread(target=dispatcher.put, args=(None, 3))
+    writer.start()
+    writer.join(0.2)
+    writer.is_alive().should.be.true
+
+    release.set()
+    writer.join(5)
+    dispatcher.close(5)
+    received.should.equal([1, 2, 3])
+    dispatcher.stats()["max_lag"].should.be.greater_than(0)
+
+
+def test_handler_errors_do_not_stop_workers():
+    received = []
+
+    def handler(message):
+        if message == 1:
+            raise ValueError()
+        received.append(message)
+
+    dispatcher = MessageDispatcher()
+    dispatcher.start(handler)
+    for i in range(3):
+        dispatcher.put(None, i)
+    dispatcher.close(5)
+    received.should.equal([0, 2])
+
+
+def test_invalid_policy():
+    MessageDispatcher.when.called_with(policy="latest").should.throw(ValueError)
@@ -0,0 +1,62 @@
+import json
+import threading
+import time
+
+from binance.websocket.latest_values import LatestValues
+
+
+def book_ticker(symbol, update_id, bid):
+    return {"u": update_id, "s": symbol, "b": bid, "B": "1", "a": "1", "A": "1"}
+
+
+def test_latest_event_per_symbol():
+    values = LatestValues()
+    values.on_message(None, json.dumps(book_ticker("BNBUSDT", 1, "600.0")))
+    values.on_message(None, book_ticker("BNBUSDT", 2, "600.1"))
+    values.on_message(
+        None,
+        json.dumps(
+            {"stream": "ethusdt@bookTicker", "data": book_ticker("ETHUSDT", 3, "3000")}
+        ).encode(),
+    )
+    values.on_message(None, {"result": None, "id": 1})
+
+    values.get("BNBUSDT")["b"].should.equal("600.1")
+    values.get("BTCUSDT").should.be.none
+    sorted(values.snapshot()).should.equal(["BNBUSDT", "ETHUSDT"])
+    values.updates.should.equal(3)
+
+
+def test_all_market_arrays():
+    values = LatestValues()
+    values.on_message(
+        None,
+        {
+            "stream": "!miniTicker@arr",
+            "data": [
+                {"e": "24hrMiniTicker", "s": "BNBUSDT", "c": "600.1"},
+                {"e": "24hrMiniTicker", "s": "ETHUSDT", "c": "3000.5"},
+            ],
+        },
+    )
+    values.get("ETHUSDT")["c"].should.equal("3000.5")
+
+
+def test_on_update_is_coalesced():
+    notified = threading.Event()
+    updates = []
+
+    def on_update(updated):
+        updates.append(updated)
+        notified.set()
+
+    values = LatestValues(on_update=on_update, interval=0.05)
+    for i in range(100):
+        values.on_message(None, book_ticker("BNBUSDT", i, str(600 + i)))
+    notified.wait(5)
+    time.sleep(0.1)
+    values.close()
+
+    len(updates).should.be.lower_than(3)
+    updates[-1].should.have.length_of(1)
+    updates[-1]["BNBUSDT"]["u"].should.equal(99)
@@ -0,0 +1,126 @@
+from unittest import mock
+
+from binance.websocket.spot.websocket_stream_pool import SpotWebsocketStreamPool
+
+
+class FakeSocketManager(object):
+    def __init__(self):
+        self.streams = {}
+
+
+class FakeStreamClient(object):
+    """Stream client recording the SUBSCRIBE and UNSUBSCRIBE messages it would send"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.socket_manager = FakeSocketManager()
+        self.messages = []
+        self.stopped = False
+        FakeStreamClient.created.append(self)
+
+    def subscribe(self, stream):
+        self.messages.append(("SUBSCRIBE", list(stream)))
+        self.socket_manager.streams.update(dict.fromkeys(stream))
+
+    def unsubscribe(self, stream):
+        self.messages.append(("UNSUBSCRIBE", list(stream)))
+        for name in stream:
+            self.socket_manager.streams.pop(name)
+
+    def stop(self):
+        self.stopped = True
+
+
+def symbols(count, start=0):
+    return ["sym{}usdt@bookTicker".format(i) for i in range(start, start + count)]
+
+
+def create_pool(**kwargs):
+    FakeStreamClient.created = []
+    return SpotWebsocketStreamPool(on_message=lambda _, message: None, **kwargs)
+
+
+def loads(pool):
+    return [len(shard.socket_manager.streams) for shard in pool.shards]
+
+
+@mock.patch(
+    "binance.websocket.spot.websocket_stream_pool.SpotWebsocketStreamClient",
+    FakeStreamClient,
+)
+def test_streams_spread_over_connections():
+    pool = create_pool(connections=3, max_streams=10, reconnect=True)
+    pool.subscribe(symbols(7))
+
+    loads(pool).should.equal([3, 2, 2])
+    sorted(pool.streams).should.equal(sorted(symbols(7)))
+    shard = pool.shards[0]
+    shard.kwargs["is_combined"].should.be.true
+    shard.kwargs["reconnect"].should.be.true
+    # one SUBSCRIBE per shard
+    shard.messages.should.have.length_of(1)
+
+
+@mock.patch(
+    "binance.websocket.spot.websocket_stream_pool.SpotWebsocketStreamClient",
+    FakeStreamClient,
+)
+def test_connections_added_when_shards_are_full():
+    pool = create_pool(connections=1, max_streams=4)
+    pool.subscribe(symbols(3))
+    loads(pool).should.equal([3])
+
+    pool.subscribe(symbols(3, start=3) + symbols(1))
+    loads(pool).should.equal([3, 3])
+
+
+@mock.patch(
+    "binance.websocket.spot.websocket_stream_pool.SpotWebsocketStreamClient",
+    FakeStreamClient,
+)
+def test_unsubscribe_rebalances():
+    pool = create_pool(connections=2, max_streams=3)
+    pool.subscribe(symbols(6))
+    loads(pool).should.equal([3, 3])
+
+    pool.unsubscribe(symbols(3))
+    pool.shards.should.have.length_of(2)
+    sorted(loads(pool)).should.equal([1, 2])
+
+    pool.unsubscribe(symbols(2, start=3))
+    loads(pool).should.equal([1])
+    pool.streams.should.equal(symbols(1, start=5))
+    [shard.stopped for shard in FakeStreamClient.created].count(True).should.equal(1)
+
+
+@mock.patch(
+    "binance.websocket.spot.websocket_stream_pool.SpotWebsocketStreamClient",
+    FakeStreamClient,
+)
+def test_moved_streams_are_subscribed_before_unsubscribed():
+    pool = create_pool(connections=1, max_streams=2)
+    pool.subscribe(symbols(4))
+    pool.unsubscribe(symbols(2))
+
+    remaining = pool.shards[0]
+    stopped = [shard for shard in FakeStreamClient.created if shard.stopped][0]
+    remaining.messages[-1][0].should.equal("SUBSCRIBE")
+    stopped.stopped.should.be.true
+    sorted(pool.streams).should.equal(symbols(2, start=2))
+
+
+@mock.patch(
+    "binance.websocket.spot.websocket_stream_pool.SpotWebsocketStreamClient",
+    FakeStreamClient,
+)
+def test_stop():
+    pool = create_pool(connections=2)
+    pool.subscribe(symbols(4))
+    pool.subscribe(symbols(1))
+    loads(pool).should.equal([2, 2])
+    pool.stop()
+
+    pool.shards.should.be.empty
+    [shard.stopped for shard in FakeStreamClient.created].should.equal([True, True])